@@ -45,6 +45,7 @@ class AnalogySolver:
             RuntimeError: If no rules were fired during the rewrite.
         """
         self.engine.trace.clear()  # Clear any existing trace from previous rewrites
+        fired = self.engine.steps  # Counted in every trace mode, even when nothing is kept
 
         # Perform the rewrite of A
         got = self.engine.rewrite(A)
@@ -54,7 +55,7 @@ class AnalogySolver:
             raise ValueError(f"Failed to learn: got {got!r}, expected {B!r}")
 
         # If no rules were fired during the rewrite, raise an error
-        if not self.engine.trace:
+        if self.engine.steps == fired:
             raise RuntimeError("No rules fired during rewrite")
 
         return TermRule("_", "_")
@@ -0,0 +1,60 @@
+"""
+Limits on a single `TermRewriteSystem.rewrite` call, and how it ended (including when it
+was stopped because it went round in a cycle).
+
+When a budget runs out the engine stops firing rules, finishes the pass it is in (so the
+result reflects exactly the steps that fired), and reports why it stopped.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import NamedTuple
+
+from .term import Node, Term
+
+# Why a rewrite stopped.
+NORMAL = "normal"  # a pass fired nothing: the term is in normal form
+MAX_PASSES = "max passes"  # the `max` argument of `rewrite` was reached
+STEP_LIMIT = "step limit"
+TIME_LIMIT = "time limit"
+SIZE_LIMIT = "size limit"
+CYCLE = "cycle"  # the term came back to an earlier state
+
+
+@dataclass(frozen=True)
+class Budget:
+    """
+    Attributes:
+        max_steps (int | None): Most rule firings per call.
+        time_limit (float | None): Most wall-clock seconds per call.
+        max_size (int | None): Largest term allowed, counted by `term_size`.
+    """
+
+    max_steps: int | None = None
+    time_limit: float | None = None
+    max_size: int | None = None
+
+
+class RewriteResult(NamedTuple):
+    term: Term
+    status: str
+    steps: int
+    passes: int
+    # Number of passes around the loop, when `status` is CYCLE.
+    cycle_length: int = 0
+
+
+def term_size(term: Term) -> int:
+    """
+    The number of subterms of `term`: every atom, Node and Seq counts one.
+
+    >>> from lsd.term import Seq
+    >>> term_size(Seq("a", Node("F", "b", "c")))
+    6
+    """
+    if isinstance(term, Node):
+        return 1 + term_size(term.head) + sum(term_size(t) for t in term.body)
+    if isinstance(term, tuple):
+        return 1 + sum(term_size(t) for t in term)
+    return 1
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from collections import OrderedDict
+from typing import Any, NamedTuple
+
+from .index import ANY, NODE
+from .term import Term
+
+_MISSING: Any = object()
+
+
+class CacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class NormalFormCache:
+    """
+    A bounded LRU map from terms to their normal forms.
+
+    Each entry remembers the index keys (see `lsd.index.term_key`) of every subterm that was
+    tried against the rules while deriving it. A rule added later can only change that
+    derivation if its pattern key is among them, so `invalidate` drops just those entries.
+
+    >>> cache = NormalFormCache(maxsize=2)
+    >>> cache.store("a", "b", {("atom", "a")})
+    >>> cache.lookup("a")
+    ('b', frozenset({('atom', 'a')}))
+    >>> cache.invalidate(("atom", "a"))
+    >>> cache.lookup("a") is None
+    True
+    >>> cache.info()
+    CacheInfo(hits=1, misses=1, maxsize=2, currsize=0)
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Term, tuple[Term, frozenset]] = OrderedDict()
+
+    def lookup(self, term: Term) -> tuple[Term, frozenset] | None:
+        """The cached (normal form, keys) for `term`, or None."""
+        try:
+            entry = self._entries.get(term, _MISSING)
+        except TypeError:
+            return None
+        if entry is _MISSING:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(term)
+        return entry
+
+    def store(self, term: Term, normal: Term, keys: set | frozenset) -> None:
+        """Remember that `term` normalizes to `normal`, having visited `keys`."""
+        if self.maxsize <= 0:
+            return
+        try:
+            self._entries[term] = (normal, frozenset(keys))
+        except TypeError:
+            return
+        self._entries.move_to_end(term)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key: tuple) -> None:
+        """Drop every entry whose derivation a rule with pattern key `key` could change."""
+        if key[0] == ANY:
+            self._entries.clear()
+            return
+        if key == (NODE, ANY):
+            stale = [t for t, (_, keys) in self._entries.items() if any(k[0] == NODE for k in keys)]
+        else:
+            stale = [t for t, (_, keys) in self._entries.items() if key in keys]
+        for t in stale:
+            del self._entries[t]
+
+    def clear(self) -> None:
+        """Drop every entry (the hit/miss counters are kept)."""
+        self._entries.clear()
+
+    def info(self) -> CacheInfo:
+        return CacheInfo(self.hits, self.misses, self.maxsize, len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
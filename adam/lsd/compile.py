@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+from typing import Any, Callable
+
+from .env import Env
+from .match import SeqPlan, _match_seq, _match_var, _materialize, match_pattern
+from .term import LetterSeq, Node, Seq, SeqView, Term, Var, Wildcard
+
+type Matcher = Callable[[Any, Env], Env | None]
+
+
+def compile_pattern(pattern: Term | Any) -> Matcher:
+    """
+    Compile `pattern` into a matcher function equivalent to
+    `lambda target, env: match_pattern(pattern, target, env)`.
+
+    All dispatch on the pattern's shape happens here, once; the returned closure only
+    inspects the target.
+
+    >>> from lsd.parser import parse
+    >>> m = compile_pattern(parse("f[!X b]"))
+    >>> m(parse("f[a b]"), Env())
+    Env({'X': ('a',)})
+    >>> m(parse("f[a c]"), Env()) is None
+    True
+    """
+    if is_ground(pattern):
+        return _compile_literal(pattern)
+    if isinstance(pattern, Wildcard):
+        return _compile_wildcard(pattern)
+    if isinstance(pattern, Var):
+        return _compile_var(pattern)
+    if isinstance(pattern, Seq):
+        return _compile_seq(pattern)
+    if isinstance(pattern, Node):
+        return _compile_node(pattern)
+    return _compile_literal(pattern)
+
+
+def is_ground(term: Term | Any) -> bool:
+    """Does `term` contain no variables or wildcards?"""
+    if isinstance(term, (Var, Wildcard)):
+        return False
+    if isinstance(term, Node):
+        return is_ground(term.head) and is_ground(term.body)
+    if isinstance(term, tuple):
+        return all(is_ground(t) for t in term)
+    return True
+
+
+def has_spread(term: Term | Any) -> bool:
+    """
+    Does `term` contain a spread variable anywhere? Only such patterns can match a target
+    in more than one way.
+    """
+    if isinstance(term, Var):
+        return term.is_spread
+    if isinstance(term, Node):
+        return has_spread(term.head) or has_spread(term.body)
+    if isinstance(term, tuple):
+        return any(has_spread(t) for t in term)
+    return False
+
+
+def _compile_literal(pattern: Term) -> Matcher:
+    def match_literal(target: Any, env: Env) -> Env | None:
+        return env if target == pattern else None
+
+    return match_literal
+
+
+def _compile_wildcard(pattern: Wildcard) -> Matcher:
+    single = Seq(pattern)
+
+    def match_wildcard(target: Any, env: Env) -> Env | None:
+        if isinstance(target, (Seq, SeqView)):
+            return _match_seq(single, target, env)
+        return env
+
+    return match_wildcard
+
+
+def _compile_var(pattern: Var) -> Matcher:
+    if pattern.guards:
+
+        def match_guarded_var(target: Any, env: Env) -> Env | None:
+            if isinstance(target, Var) and target == pattern:
+                return env
+            return _match_var(pattern, target, env)
+
+        return match_guarded_var
+
+    name = pattern.name
+    span = pattern.span
+    spread = pattern.is_spread
+
+    def match_var(target: Any, env: Env) -> Env | None:
+        if isinstance(target, Var) and target == pattern:
+            return env
+        if spread and isinstance(target, (Seq, SeqView, LetterSeq)):
+            value = _materialize(target)
+        else:
+            value = (target,)
+        if len(value) not in span:
+            return None
+        prev = env.get(name)
+        if prev is None:
+            return env.bind(name, value)
+        return env if prev == value else None
+
+    return match_var
+
+
+def _compile_seq(pattern: Seq) -> Matcher:
+    # A later element failing may require backtracking into an earlier one, which only the
+    # shared sequence matcher in `lsd.match` does.
+    if has_spread(pattern):
+        plan = SeqPlan.of(pattern)
+
+        def match_spread_seq(target: Any, env: Env) -> Env | None:
+            if isinstance(target, LetterSeq):
+                target = target.to_seq()
+            elif not isinstance(target, (Seq, SeqView)):
+                return env if isinstance(target, tuple) and target == pattern else None
+            if target == pattern:
+                return env
+            return _match_seq(pattern, target, env, plan)
+
+        return match_spread_seq
+
+    # Without spread variables every pattern element consumes exactly one target element,
+    # except that trailing optional variables may be left over when the target runs out.
+    elems = tuple(compile_pattern(p) for p in pattern)
+    size = len(elems)
+    tails = tuple(
+        (
+            tuple(p.name for p in pattern[i:])
+            if all(isinstance(p, Var) and p.is_optional for p in pattern[i:])
+            else None
+        )
+        for i in range(size + 1)
+    )
+
+    def match_fixed_seq(target: Any, env: Env | None) -> Env | None:
+        if isinstance(target, LetterSeq):
+            target = target.to_seq()
+        elif not isinstance(target, (Seq, SeqView)):
+            return env if isinstance(target, tuple) and target == pattern else None
+        if target == pattern:
+            return env
+        n = len(target)
+        if n > size:
+            return None
+        for elem, t in zip(elems, target):
+            env = elem(t, env)  # type: ignore[arg-type]
+            if env is None:
+                return None
+        if n < size:
+            names = tails[n]
+            if names is None:
+                return None
+            for name in names:
+                prev = env.get(name)  # type: ignore[union-attr]
+                if prev is None:
+                    env = env.bind(name, ())  # type: ignore[union-attr]
+                elif prev != ():
+                    return None
+        return env
+
+    return match_fixed_seq
+
+
+def _compile_node(pattern: Node) -> Matcher:
+    if has_spread(pattern.head):
+
+        def match_node_backtracking(target: Any, env: Env) -> Env | None:
+            return match_pattern(pattern, target, env)
+
+        return match_node_backtracking
+
+    head = compile_pattern(pattern.head)
+    body = compile_pattern(pattern.body)
+
+    def match_node(target: Any, env: Env) -> Env | None:
+        if not isinstance(target, Node):
+            return None
+        if target == pattern:
+            return env
+        env2 = head(target.head, env)
+        if env2 is None:
+            return None
+        return body(target.body, env2)
+
+    return match_node
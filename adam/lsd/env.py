@@ -1,22 +1,34 @@
 from __future__ import annotations
 
-from collections import UserDict
+from collections.abc import Iterator, Mapping
+from typing import Any
 
+_MISSING: Any = object()
 
-class Env(UserDict[str, tuple]):
+
+class Env(Mapping[str, tuple]):
     """
     A class that represents an environment in which variables are bound to values.
 
-    This class is a specialized dictionary where:
+    This class is an immutable mapping where:
     - The keys are variable names (strings).
     - The values are tuples, even if they represent a single value.
     - An empty tuple is used to represent "None", indicating that no value is bound to the variable.
 
+    Environments are persistent linked frames: every `Env` holds at most one binding plus a
+    reference to the parent environment it extends. Adding a binding is O(1) and never copies
+    or mutates the parent, so a matcher can keep the old environment around as a rollback point
+    and discard a failed branch for free.
+
     Attributes:
-        data (dict): A dictionary that holds variable bindings.
+        parent (Env | None): The environment this frame extends, or None for the root frame.
     """
 
-    def __init__(self, bindings={}, **kwargs):
+    __slots__ = ("parent", "_name", "_value", "_flat")
+
+    parent: Env | None
+
+    def __init__(self, bindings: Mapping[str, Any] = {}, **kwargs):
         """
         Initializes an `Env` object with a set of variable bindings.
 
@@ -27,33 +39,114 @@ class Env(UserDict[str, tuple]):
         Example:
             env = Env({"x": (1,)})  # Creates an environment where 'x' is bound to (1,).
         """
-        super().__init__({**bindings, **kwargs})
+        items = {**bindings, **kwargs}
+        parent = None
+        name, value = None, _MISSING
+        if items:
+            *init, (name, value) = items.items()
+            parent = Env._from_items(init)
+        self.parent = parent
+        self._name = name
+        self._value = value
+        self._flat = None
+
+    @classmethod
+    def _frame(cls, parent: Env | None, name: str | None, value: Any) -> Env:
+        """Build a single frame without going through `__init__`."""
+        env = object.__new__(cls)
+        env.parent = parent
+        env._name = name
+        env._value = value
+        env._flat = None
+        return env
+
+    @classmethod
+    def _from_items(cls, items) -> Env | None:
+        env = None
+        for name, value in items:
+            env = cls._frame(env, name, value)
+        return env
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """
+        Look up the innermost binding of `name`, walking parent frames as needed.
 
-    def bind(self, name: str, value):
+        Args:
+            name (str): The name of the variable to look up.
+            default (any, optional): Returned when `name` is unbound. Defaults to None.
+
+        Returns:
+            any: The bound value, or `default`.
+        """
+        if self._flat is not None:
+            return self._flat.get(name, default)
+        env = self
+        while env is not None:
+            if env._name == name and env._value is not _MISSING:
+                return env._value
+            env = env.parent
+        return default
+
+    def __getitem__(self, name: str) -> tuple:
+        value = self.get(name, _MISSING)
+        if value is _MISSING:
+            raise KeyError(name)
+        return value
+
+    def __contains__(self, name: object) -> bool:
+        return self.get(name, _MISSING) is not _MISSING  # type: ignore[arg-type]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.flatten())
+
+    def __len__(self) -> int:
+        return len(self.flatten())
+
+    def __repr__(self) -> str:
+        return f"Env({self.flatten()!r})"
+
+    def flatten(self) -> dict[str, tuple]:
+        """
+        Collapse the chain of frames into a plain dictionary (innermost binding wins).
+
+        The result is cached on the frame, which is safe because frames never change.
+
+        Returns:
+            dict: The visible variable bindings.
+        """
+        if self._flat is None:
+            frames = []
+            env = self
+            while env is not None:
+                if env._value is not _MISSING:
+                    frames.append(env)
+                env = env.parent
+            self._flat = {f._name: f._value for f in reversed(frames)}
+        return self._flat
+
+    def bind(self, name: str, value) -> Env:
         """
         Binds a variable to a value in the environment.
 
-        This method updates the environment by adding or updating a variable binding.
+        The receiver is left untouched; the binding lives in a new frame on top of it.
 
         Args:
             name (str): The name of the variable to bind.
             value (any): The value to bind to the variable.
 
         Returns:
-            Env: The updated environment with the new binding.
+            Env: The environment with the new binding.
 
         Example:
-            env.bind("x", 10)  # Binds 'x' to the value 10 in the environment.
+            env = env.bind("x", 10)  # Binds 'x' to the value 10 in the returned environment.
         """
-        self[name] = value
-        return self
+        return Env._frame(self, name, value)
 
     def extend(self, name: str, value: tuple) -> Env:
         """
         Returns a new environment that is an extension of the current one, with the addition of a new variable binding.
 
-        This method creates a fresh environment that includes all the bindings from the current environment
-        plus the new binding `name → value`.
+        This is O(1): the new environment shares every existing binding with the current one.
 
         Args:
             name (str): The name of the variable to bind in the new environment.
@@ -65,9 +158,7 @@ class Env(UserDict[str, tuple]):
         Example:
             new_env = env.extend("y", (5,))  # Creates a new environment with 'y' bound to (5,) in addition to the original bindings.
         """
-        new_env = Env(self)
-        new_env.data[name] = value
-        return new_env
+        return Env._frame(self, name, value)
 
     @classmethod
     def ensure(cls, value: Env | dict | None) -> Env | None:
@@ -87,7 +178,7 @@ class Env(UserDict[str, tuple]):
         Example:
             env = Env.ensure({"a": (1,)})  # Converts the dictionary to an Env object.
         """
-        return cls(*value) if isinstance(value, dict) else value
+        return cls(value) if isinstance(value, dict) else value
 
     @staticmethod
     def combine(left: Env | dict | None, right: Env | dict | None) -> Env | None:
@@ -95,7 +186,8 @@ class Env(UserDict[str, tuple]):
         Combines two environments or dictionaries into one.
 
         If either `left` or `right` is `None`, the function returns `None`.
-        Otherwise, it merges the two environments and returns a new `Env` object.
+        Otherwise, the bindings of `right` are layered on top of `left` (sharing `left`'s frames
+        when it is already an `Env`).
 
         Args:
             left (Env | dict | None): The first environment or dictionary to combine.
@@ -109,4 +201,7 @@ class Env(UserDict[str, tuple]):
         """
         if left is None or right is None:
             return None
-        return Env({**left, **right})
+        env = left if isinstance(left, Env) else Env(left)
+        for name, value in right.items():
+            env = env.bind(name, value)
+        return env
@@ -0,0 +1,249 @@
+"""
+Terms as flat arrays, for matching and hashing many terms without walking object graphs.
+
+A term is stored in preorder, one slot per subterm, in two parallel integer arrays:
+
+- `codes[i]`: an atom's symbol id (>= 0, see `SymbolTable`), or a tag for a Seq or Node that
+  also records its number of children, so one comparison checks both kind and arity.
+- `sizes[i]`: the number of slots of the subterm starting at `i`, so `i + sizes[i]` skips it.
+
+A Node's children are its head followed by its body. Symbol ids only mean something
+relative to the table that issued them, so flat terms are compared within one table.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Any, Iterator
+
+from .term import Node, Seq, Term, Var, Wildcard
+
+# Codes below zero: VAR marks a pattern variable; Seqs and Nodes get `seq_tag`/`node_tag`.
+VAR = -1
+
+
+def seq_tag(n: int) -> int:
+    return -2 - 2 * n
+
+
+def node_tag(n: int) -> int:
+    return -3 - 2 * n
+
+
+class SymbolTable:
+    """
+    Maps atoms to small integers, so an encoded term is a nest of tuples and ints.
+
+    >>> table = SymbolTable()
+    >>> code = table.encode(Seq("F", "+", Node("G", "F")))
+    >>> code
+    (0, 1, [2, 0])
+    >>> table.decode(code)
+    Seq(F, +, G(F))
+    """
+
+    __slots__ = ("symbols", "_codes")
+
+    def __init__(self, symbols: list[Any] | None = None):
+        self.symbols: list[Any] = [] if symbols is None else symbols
+        self._codes: dict[tuple[type, Any], int] = {}
+        for code, atom in enumerate(self.symbols):
+            try:
+                self._codes.setdefault((type(atom), atom), code)
+            except TypeError:
+                pass
+
+    def encode(self, term: Term) -> Any:
+        """A Seq becomes a tuple, a Node a list `[head, *body]`, and any atom its index."""
+        if isinstance(term, Seq):
+            return tuple(self.encode(t) for t in term)
+        if isinstance(term, Node):
+            return [self.encode(term.head), *(self.encode(t) for t in term.body)]
+        return self.code(term)
+
+    def decode(self, code: Any) -> Term:
+        if isinstance(code, tuple):
+            return Seq(*(self.decode(c) for c in code))
+        if isinstance(code, list):
+            return Node(self.decode(code[0]), *(self.decode(c) for c in code[1:]))
+        return self.symbols[code]
+
+    def code(self, atom: Any) -> int:
+        """The symbol id of `atom`, issuing a new one the first time it is seen."""
+        try:
+            key = (type(atom), atom)
+            code = self._codes.get(key)
+        except TypeError:
+            key, code = None, None
+        if code is None:
+            code = len(self.symbols)
+            self.symbols.append(atom)
+            if key is not None:
+                self._codes[key] = code
+        return code
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+
+class FlatTerm:
+    """
+    A term flattened in preorder against `table` (see the module docstring).
+
+    >>> table = SymbolTable()
+    >>> flat = FlatTerm.encode(Node("F", "a", Seq("b", "a")), table)
+    >>> list(flat.codes), list(flat.sizes)
+    ([-9, 0, 1, -6, 2, 1], [6, 1, 1, 3, 1, 1])
+    >>> flat.decode(), flat.decode(3)
+    (F(a, Seq(b, a)), Seq(b, a))
+    """
+
+    __slots__ = ("codes", "sizes", "table")
+
+    def __init__(self, codes: array, sizes: array, table: SymbolTable):
+        self.codes = codes
+        self.sizes = sizes
+        self.table = table
+
+    @classmethod
+    def encode(cls, term: Term, table: SymbolTable | None = None) -> FlatTerm:
+        table = SymbolTable() if table is None else table
+        codes, sizes = array("q"), array("q")
+        _flatten(term, table, codes, sizes, None)
+        return cls(codes, sizes, table)
+
+    def decode(self, at: int = 0) -> Term:
+        """The subterm whose slot is `at`."""
+        return _unflatten(self.codes, self.sizes, self.table.symbols, at)
+
+    def subterms(self) -> Iterator[int]:
+        """Every slot, i.e. the position of every subterm, in preorder."""
+        return iter(range(len(self.codes)))
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, FlatTerm):
+            return NotImplemented
+        return self.table is other.table and self.codes == other.codes
+
+    def __hash__(self) -> int:
+        return hash(self.codes.tobytes())
+
+    def __repr__(self) -> str:
+        return f"FlatTerm({self.decode()!r})"
+
+
+class FlatPattern:
+    """
+    A pattern made of literals and plain `!` variables, compiled to match flat terms in one
+    linear scan. `match` binds each variable to the slot of the subterm it matched.
+
+    >>> from lsd.parser import parse
+    >>> table = SymbolTable()
+    >>> pattern = FlatPattern(parse("F[!X b !X]"), table)
+    >>> flat = FlatTerm.encode(parse("G[F[a b a] F[a b c]]"), table)
+    >>> [(at, {k: flat.decode(v) for k, v in b.items()}) for at, b in pattern.search(flat)]
+    [(2, {'X': 'a'})]
+    """
+
+    __slots__ = ("pattern", "flat", "_names", "_ground")
+
+    def __init__(self, pattern: Term, table: SymbolTable):
+        self.pattern = pattern
+        codes, sizes = array("q"), array("q")
+        names: list[str] = []
+        _flatten(pattern, table, codes, sizes, names)
+        self.flat = FlatTerm(codes, sizes, table)
+        # The variable bound at each VAR slot, in slot order.
+        self._names = names
+        self._ground = not names
+
+    def match(self, target: FlatTerm, at: int = 0) -> dict[str, int] | None:
+        """The slot each variable binds if the pattern matches `target` at slot `at`."""
+        pcodes = self.flat.codes
+        tcodes, tsizes = target.codes, target.sizes
+        size = len(pcodes)
+        if self._ground:
+            if tsizes[at] == size and tcodes[at : at + size] == pcodes:
+                return {}
+            return None
+
+        bound: dict[str, int] = {}
+        names = iter(self._names)
+        j = at
+        for code in pcodes:
+            if code == VAR:
+                name = next(names)
+                prev = bound.get(name)
+                if prev is None:
+                    bound[name] = j
+                elif not _same(tcodes, tsizes, prev, j):
+                    return None
+                j += tsizes[j]
+            elif code == tcodes[j]:
+                j += 1
+            else:
+                return None
+        return bound
+
+    def search(self, target: FlatTerm) -> Iterator[tuple[int, dict[str, int]]]:
+        """`(slot, bindings)` for every subterm of `target` the pattern matches, in preorder."""
+        first = self.flat.codes[0]
+        tcodes = target.codes
+        for at in range(len(tcodes)):
+            if first == VAR or tcodes[at] == first:
+                bound = self.match(target, at)
+                if bound is not None:
+                    yield at, bound
+
+
+def _same(codes: array, sizes: array, a: int, b: int) -> bool:
+    n = sizes[a]
+    return sizes[b] == n and codes[a : a + n] == codes[b : b + n]
+
+
+def _flatten(
+    term: Term, table: SymbolTable, codes: array, sizes: array, names: list[str] | None
+) -> None:
+    at = len(codes)
+    if isinstance(term, Seq):
+        codes.append(seq_tag(len(term)))
+        sizes.append(0)
+        for t in term:
+            _flatten(t, table, codes, sizes, names)
+    elif isinstance(term, Node):
+        codes.append(node_tag(1 + len(term.body)))
+        sizes.append(0)
+        _flatten(term.head, table, codes, sizes, names)
+        for t in term.body:
+            _flatten(t, table, codes, sizes, names)
+    elif names is not None and isinstance(term, Var):
+        if term.span != (1, 1) or term.guards:
+            raise ValueError(f"Flat patterns support only plain ! variables, not {term!r}")
+        codes.append(VAR)
+        sizes.append(0)
+        names.append(term.name)
+    else:
+        if names is not None and isinstance(term, Wildcard):
+            raise ValueError(f"Flat patterns support only literals and ! variables, not {term!r}")
+        codes.append(table.code(term))
+        sizes.append(0)
+    sizes[at] = len(codes) - at
+
+
+def _unflatten(codes: array, sizes: array, symbols: list[Any], at: int) -> Term:
+    code = codes[at]
+    if code >= 0:
+        return symbols[code]
+    if code == VAR:
+        raise ValueError(f"Slot {at} is a pattern variable")
+    children = []
+    i = at + 1
+    for _ in range((-code - 2) // 2):
+        children.append(_unflatten(codes, sizes, symbols, i))
+        i += sizes[i]
+    if code % 2 == 0:
+        return Seq(*children)
+    return Node(*children)
@@ -0,0 +1,163 @@
+from __future__ import annotations
+
+from bisect import insort
+from typing import Any, Iterator, NamedTuple
+
+from .term import LetterSeq, Node, Rule, Term, Var, Wildcard
+
+# Bucket keys. A Node pattern with a literal head lives under (NODE, head); one whose head is a
+# variable lives under (NODE, ANY). Seq patterns live under (SEQ,), literal atoms under
+# (ATOM, value), and bare variables/wildcards (which can match anything) under (ANY,).
+NODE, SEQ, ATOM, ANY = "node", "seq", "atom", "any"
+
+# Candidate lists are memoized per (key, size); the memo is dropped once it grows past this.
+CACHE_LIMIT = 4096
+
+
+class Entry(NamedTuple):
+    """A rule in the index: lower `priority` is tried first."""
+
+    priority: int
+    rule: Rule
+    min_len: int
+    max_len: int | None
+
+
+class RuleIndex:
+    """
+    An ordered collection of rules, indexed by the shape of each rule's pattern.
+
+    The index is a two-level trie over the pattern's root: kind (Node, Seq, atom) and head
+    symbol, with an arity window for Node bodies and Seqs. `candidates(term)` returns only
+    the rules whose pattern could possibly match `term`, in the same order as iterating
+    over the whole collection.
+
+    >>> from lsd.term import TermRule
+    >>> index = RuleIndex()
+    >>> index.append(TermRule(Node("f", Var("X")), "a"))
+    >>> index.prepend(TermRule(Node("g", Var("X")), "b"))
+    >>> [rule.name() for rule in index.candidates(Node("f", 1))]
+    ['Rule(f(Var.!X) → a)']
+    >>> index.candidates(Node("f", 1, 2))
+    []
+    """
+
+    def __init__(self, rules: list[Rule] = []):
+        self._buckets: dict[tuple, list[Entry]] = {}
+        self._entries: list[Entry] = []
+        self._first = 0
+        self._last = -1
+        self._cache: dict[tuple, list[Rule]] = {}
+        for rule in rules:
+            self.append(rule)
+
+    def prepend(self, rule: Rule) -> None:
+        """Add `rule` at highest priority."""
+        self._first -= 1
+        self._add(self._first, rule)
+
+    def append(self, rule: Rule) -> None:
+        """Add `rule` at lowest priority."""
+        self._last += 1
+        self._add(self._last, rule)
+
+    def _add(self, priority: int, rule: Rule) -> None:
+        key, min_len, max_len = pattern_key(rule.pattern)
+        entry = Entry(priority, rule, min_len, max_len)
+        insort(self._entries, entry, key=lambda e: e.priority)
+        insort(self._buckets.setdefault(key, []), entry, key=lambda e: e.priority)
+        self._cache.clear()
+
+    def candidates(self, term: Term) -> list[Rule]:
+        """The rules that might match `term`, highest priority first."""
+        return self.lookup(*term_key(term))
+
+    def lookup(self, key: tuple | None, size: int) -> list[Rule]:
+        """The rules that might match a term with bucket key `key` and size `size`."""
+        cache_key = (key, size)
+        try:
+            return self._cache[cache_key]
+        except KeyError:
+            pass
+        except TypeError:
+            return self._select(key, size)
+        if len(self._cache) >= CACHE_LIMIT:
+            self._cache.clear()
+        rules = self._cache[cache_key] = self._select(key, size)
+        return rules
+
+    def _select(self, key: tuple | None, size: int) -> list[Rule]:
+        buckets = [self._buckets.get((ANY,), [])]
+        if key is not None:
+            if key[0] == NODE:
+                buckets.append(self._buckets.get((NODE, ANY), []))
+            buckets.append(self._get_bucket(key))
+        entries = sorted(
+            (e for bucket in buckets for e in bucket),
+            key=lambda e: e.priority,
+        )
+        return [
+            e.rule
+            for e in entries
+            if e.min_len <= size and (e.max_len is None or size <= e.max_len)
+        ]
+
+    def _get_bucket(self, key: tuple) -> list[Entry]:
+        try:
+            return self._buckets.get(key, [])
+        except TypeError:
+            return []
+
+    def __iter__(self) -> Iterator[Rule]:
+        return (e.rule for e in self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def pattern_key(pattern: Term | Any) -> tuple[tuple, int, int | None]:
+    """
+    The bucket key for a pattern, plus the range of sizes (Node arity or Seq length) of the
+    terms it can match.
+    """
+    if isinstance(pattern, (Var, Wildcard)):
+        return (ANY,), 0, None
+    if isinstance(pattern, Node):
+        min_len, max_len = _seq_bounds(pattern.body)
+        head = pattern.head
+        if isinstance(head, (Var, Wildcard)) or not _hashable(head):
+            return (NODE, ANY), min_len, max_len
+        return (NODE, head), min_len, max_len
+    if isinstance(pattern, tuple):
+        return (SEQ,), *_seq_bounds(pattern)
+    if not _hashable(pattern):
+        return (ANY,), 0, None
+    return (ATOM, pattern), 0, None
+
+
+def term_key(term: Term | Any) -> tuple[tuple | None, int]:
+    """The bucket key and size used to look up candidate rules for `term`."""
+    if isinstance(term, Node):
+        return (NODE, term.head), len(term.body)
+    if isinstance(term, (tuple, LetterSeq)):
+        return (SEQ,), len(term)
+    return (ATOM, term), 0
+
+
+def _seq_bounds(pattern: tuple) -> tuple[int, int | None]:
+    """
+    Bounds on the number of target elements a Seq pattern can match. Optional and spread
+    variables may match nothing; a spread variable makes the upper bound open.
+    """
+    min_len = sum(1 for p in pattern if not (isinstance(p, Var) and (p.is_optional or p.is_spread)))
+    if any(isinstance(p, Var) and p.is_spread for p in pattern):
+        return min_len, None
+    return min_len, len(pattern)
+
+
+def _hashable(value: Any) -> bool:
+    try:
+        hash(value)
+    except TypeError:
+        return False
+    return True
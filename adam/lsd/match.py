@@ -1,10 +1,10 @@
 from __future__ import annotations
 
-from copy import deepcopy
-from typing import Any, Optional
+from itertools import islice
+from typing import Any, Iterator, NamedTuple, Optional
 
 from .env import Env
-from .term import Node, Seq, Term, Var, Wildcard
+from .term import LetterSeq, Node, Seq, SeqView, Term, Var, Wildcard, check_guard
 
 
 def match_pattern(
@@ -14,38 +14,77 @@ def match_pattern(
 ) -> Env | None:
     """
     Try to match `pattern` against `target`, threading through `env`.
-    Returns a fresh Env on success, or None on failure.
+    Returns an Env extending `env` on success, or None on failure.
+    `env` itself is never modified, so callers can keep it to backtrack.
     """
-    env = deepcopy(env) if env is not None else Env()
+    return next(_iter_pattern(pattern, target, env if env is not None else Env()), None)
 
+
+def match_all(
+    pattern: Term | Any,
+    target: Term | Any,
+    env: Env | None = None,
+    limit: int | None = None,
+) -> Iterator[Env]:
+    """
+    Lazily yield every Env under which `pattern` matches `target`.
+
+    Alternatives are produced by backtracking, one at a time and in the order `match_pattern`
+    would consider them (so the first one yielded is what `match_pattern` returns). Stop
+    iterating at any point to abandon the search, or pass `limit` to cap the number of results.
+
+    >>> from lsd.parser import parse
+    >>> [dict(e) for e in match_all(parse("*A x *B"), parse("a x b x c"))]
+    [{'A': ('a',), 'B': ('b', 'x', 'c')}, {'A': ('a', 'x', 'b'), 'B': ('c',)}]
+    >>> len(list(match_all(parse("*A x *B"), parse("a x b x c"), limit=1)))
+    1
+    """
+    envs = _iter_pattern(pattern, target, env if env is not None else Env())
+    return envs if limit is None else islice(envs, limit)
+
+
+def _iter_pattern(
+    pattern: Term | Any,
+    target: Term | Any,
+    env: Env,
+) -> Iterator[Env]:
+    """
+    The backtracking core shared by `match_pattern` and `match_all`: yield every Env
+    extending `env` under which `pattern` matches `target`.
+    """
     # 1) Literal equality
     if pattern == target:
-        return env
+        yield env
+        return
 
     # 2) Wildcard matches anything (does not bind to the environment)
     if isinstance(pattern, Wildcard):
-        if isinstance(target, Seq):
-            return _match_seq(Seq(pattern), target, env)
-        return env
+        if isinstance(target, (Seq, SeqView)):
+            yield from _iter_seq(Seq(pattern), target, env)
+        else:
+            yield env
+        return
 
     # 3) Variable matching
     if isinstance(pattern, Var):
-        return _match_var(pattern, target, env)
+        env2 = _match_var(pattern, target, env)
+        if env2 is not None:
+            yield env2
+        return
 
     # 4) Sequence matching
-    if isinstance(pattern, Seq) and isinstance(target, Seq):
-        return _match_seq(pattern, target, env)
+    if isinstance(pattern, Seq) and isinstance(target, LetterSeq):
+        target = target.to_seq()
+    if isinstance(pattern, Seq) and isinstance(target, (Seq, SeqView)):
+        yield from _iter_seq(pattern, target, env)
+        return
 
     # 5) Node matching
     if isinstance(pattern, Node) and isinstance(target, Node):
-        env2 = match_pattern(pattern.head, target.head, env)
-        if env2 is None:
-            return None
-        if env3 := match_pattern(pattern.body, target.body, env2):
-            return env3
+        for env2 in _iter_pattern(pattern.head, target.head, env):
+            yield from _iter_pattern(pattern.body, target.body, env2)
 
     # No match found
-    return None
 
 
 def _match_var(
@@ -73,7 +112,7 @@ def _match_var(
     value = (
         (target,)
         if not pattern.is_spread
-        else tuple(target) if isinstance(target, Seq) else (target,)
+        else _materialize(target) if isinstance(target, (Seq, SeqView, LetterSeq)) else (target,)
     )
 
     # 3) Span check (e.g., *X requires at least one element, +X requires >=1)
@@ -87,60 +126,243 @@ def _match_var(
     return env if prev == value else None
 
 
+def _materialize(target: Seq | SeqView | LetterSeq) -> tuple:
+    return target.materialize() if isinstance(target, SeqView) else tuple(target)
+
+
 def _match_seq(
     p_seq: Seq,
-    t_seq: Seq,
+    t_seq: Seq | SeqView,
     env: Env,
+    plan: SeqPlan | None = None,
 ) -> Optional[Env]:
     """
     Match sequence patterns, handling both fixed and spread variables, including wildcards.
 
     Args:
         p_seq (Seq): The pattern sequence to match.
-        t_seq (Seq): The target sequence to match against.
+        t_seq (Seq | SeqView): The target sequence to match against.
         env (Env): The current environment holding variable bindings.
+        plan (SeqPlan, optional): `SeqPlan.of(p_seq)`, if the caller has already built it.
 
     Returns:
-        Optional[Env]: The updated environment if the match is successful, or None if matching fails.
+        Optional[Env]: The first environment under which the sequences match, or None if
+            matching fails.
     """
-    p_elems = list(p_seq)
-    t_elems = list(t_seq)
+    return next(_iter_seq(p_seq, t_seq, env, plan), None)
 
-    # Both sequences empty -> match successful
-    if not p_elems and not t_elems:
-        return env
 
-    # Pattern is empty, but target has remaining elements -> fail
-    if not p_elems:
-        return None
+class SeqPlan(NamedTuple):
+    """
+    Length bounds and variable sets for every suffix of a pattern sequence.
 
-    # Target is empty, pattern must consist of optional vars
-    if not t_elems:
-        e2 = deepcopy(env)
-        for pe in p_elems:
-            if not (isinstance(pe, Var) and pe.is_optional):
-                return None
-            e2[pe.name] = ()
-        return e2
-
-    first, *rest = p_elems
-
-    # 2) Spread variable at the front: try all possible splits
-    if isinstance(first, Var) and first.is_spread:
-        for cut in range(len(t_elems) - len(rest) + 1):
-            candidate = tuple(t_elems[:cut])
-            e2 = deepcopy(env)
-            prev = e2.get(first.name)
-            if prev is not None and prev != candidate:
-                continue
-            e2[first.name] = candidate
-            res = _match_seq(Seq(*rest), Seq(*t_elems[cut:]), e2)
-            if res is not None:
-                return res
-        return None
+    `min_need[i]` and `max_need[i]` bound how many target elements `elems[i:]` can consume
+    (`max_need[i]` is None when a spread variable makes it unbounded). The sequence matcher
+    uses them to skip cuts of a spread variable that leave too few or too many elements for
+    the rest of the pattern. `suffix_vars[i]` names the variables occurring in `elems[i:]`:
+    the only bindings that can influence how that suffix matches.
 
-    # 3) Non-spread variable: match head and recurse on the rest
-    env2 = match_pattern(first, t_elems[0], deepcopy(env))
-    if env2 is None:
-        return None
-    return _match_seq(Seq(*rest), Seq(*t_elems[1:]), env2)
+    >>> from lsd.parser import parse
+    >>> plan = SeqPlan.of(parse("*A !x +B c"))
+    >>> plan.min_need, plan.max_need
+    ((3, 3, 2, 1, 0), (None, None, None, 1, 0))
+    >>> plan.suffix_vars
+    (('A', 'B', 'x'), ('B', 'x'), ('B',), (), ())
+    """
+
+    elems: tuple
+    min_need: tuple[int, ...]
+    max_need: tuple[int | None, ...]
+    suffix_vars: tuple[tuple[str, ...], ...]
+
+    @classmethod
+    def of(cls, p_seq: Seq) -> SeqPlan:
+        elems = tuple(p_seq)
+        min_need = [0] * (len(elems) + 1)
+        max_need: list[int | None] = [0] * (len(elems) + 1)
+        suffix_vars: list[tuple[str, ...]] = [()] * (len(elems) + 1)
+        for i in range(len(elems) - 1, -1, -1):
+            lo, hi = _consumes(elems[i])
+            min_need[i] = lo + min_need[i + 1]
+            rest = max_need[i + 1]
+            max_need[i] = None if hi is None or rest is None else hi + rest
+            suffix_vars[i] = tuple(sorted(set(suffix_vars[i + 1]) | _var_names(elems[i])))
+        return cls(elems, tuple(min_need), tuple(max_need), tuple(suffix_vars))
+
+
+def _consumes(elem: Term | Any) -> tuple[int, int | None]:
+    """How many target elements a single pattern element can match."""
+    if isinstance(elem, Var):
+        if elem.is_spread:
+            return elem.span.start, elem.span.stop
+        return (0, 1) if elem.is_optional else (1, 1)
+    return 1, 1
+
+
+def _var_names(term: Term | Any) -> set[str]:
+    """The names of all variables occurring in `term`."""
+    if isinstance(term, Var):
+        return {term.name}
+    if isinstance(term, Node):
+        return _var_names(term.head) | _var_names(term.body)
+    if isinstance(term, tuple):
+        return set().union(*map(_var_names, term))
+    return set()
+
+
+def _iter_seq(
+    p_seq: Seq,
+    t_seq: Seq | SeqView,
+    env: Env,
+    plan: SeqPlan | None = None,
+) -> Iterator[Env]:
+    """
+    Yield every environment under which the pattern sequence matches the target sequence.
+
+    Args:
+        p_seq (Seq): The pattern sequence to match.
+        t_seq (Seq | SeqView): The target sequence to match against.
+        env (Env): The current environment holding variable bindings.
+        plan (SeqPlan, optional): `SeqPlan.of(p_seq)`, if the caller has already built it.
+    """
+    for result in SeqSearch(plan or SeqPlan.of(p_seq), t_seq).at(0, 0, env):
+        yield _materialize_views(result)
+
+
+def _materialize_views(env: Env) -> Env:
+    """Replace spread bindings that are still `SeqView`s with tuples."""
+    for name, value in env.items():
+        if isinstance(value, SeqView):
+            env = env.bind(name, value.materialize())
+    return env
+
+
+class SeqSearch:
+    """
+    One backtracking search of a pattern sequence (given by its plan) against a target.
+
+    The target is only ever read by position through `base[offset + j]`, so the search runs
+    over a `SeqView` of a larger Seq without copying it. Spread variables are bound to views
+    too, so trying a cut is O(1); `_iter_seq` turns them into tuples once a match is found.
+
+    A search state is (pattern index, target index, bindings of the variables still ahead in
+    the pattern); nothing else affects whether the rest of the pattern can match. States that
+    were fully explored without a single match are remembered in `failed` and never explored
+    again, so a pattern like `*A a *B a *C b` visits each state at most once instead of once
+    per way of reaching it. `explored` counts the states actually expanded.
+
+    Attributes:
+        plan (SeqPlan): Precomputed facts about the pattern.
+        base (tuple): The storage the target is a window of.
+        offset (int): Where the target starts in `base`.
+        size (int): The length of the target.
+        runs (dict): Per guarded spread variable (by pattern index), how many consecutive
+            target elements starting at each position satisfy its guards.
+        failed (set): Keys of states known to have no match.
+        explored (int): Number of states expanded so far.
+    """
+
+    __slots__ = ("plan", "base", "offset", "size", "runs", "failed", "explored")
+
+    def __init__(self, plan: SeqPlan, target: Seq | SeqView):
+        self.plan = plan
+        if isinstance(target, SeqView):
+            self.base, self.offset, self.size = target.base, target.start, len(target)
+        else:
+            self.base, self.offset, self.size = target, 0, len(target)
+        self.runs: dict[int, list[int]] = {}
+        self.failed: set[tuple] = set()
+        self.explored = 0
+
+    def at(self, i: int, j: int, env: Env) -> Iterator[Env]:
+        """Match `plan.elems[i:]` against the target from position `j` on."""
+        plan = self.plan
+        remaining = self.size - j
+
+        # The rest of the pattern cannot consume exactly what is left -> fail
+        if remaining < plan.min_need[i]:
+            return
+        max_need = plan.max_need[i]
+        if max_need is not None and remaining > max_need:
+            return
+
+        # Already shown to fail from this state -> fail
+        key: tuple | None = (i, j, *(env.get(name) for name in plan.suffix_vars[i]))
+        try:
+            if key in self.failed:
+                return
+        except TypeError:
+            key = None  # some binding is unhashable; explore without memoizing
+
+        self.explored += 1
+        found = False
+        for env2 in self._expand(i, j, env, remaining):
+            found = True
+            yield env2
+        if not found and key is not None:
+            self.failed.add(key)
+
+    def _expand(self, i: int, j: int, env: Env, remaining: int) -> Iterator[Env]:
+        plan, base, k = self.plan, self.base, self.offset + j
+
+        # Both sequences exhausted -> match successful
+        if i == len(plan.elems):
+            yield env
+            return
+
+        # Target is exhausted, so the rest of the pattern is optional vars (min_need is 0)
+        if remaining == 0:
+            for pe in plan.elems[i:]:
+                prev = env.get(pe.name)
+                if prev is None:
+                    env = env.bind(pe.name, ())
+                elif prev != ():
+                    return
+            yield env
+            return
+
+        first = plan.elems[i]
+
+        # 2) Spread variable at the front: try every cut the rest of the pattern can absorb
+        if isinstance(first, Var) and first.is_spread:
+            rest_max = plan.max_need[i + 1]
+            lo = (
+                first.span.start
+                if rest_max is None
+                else max(first.span.start, remaining - rest_max)
+            )
+            hi = min(first.span.stop or remaining, remaining - plan.min_need[i + 1])
+
+            prev = env.get(first.name)
+            if prev is not None:
+                cut = len(prev)
+                if lo <= cut <= hi and all(base[k + n] == v for n, v in enumerate(prev)):
+                    yield from self.at(i + 1, j + cut, env)
+                return
+
+            if first.guards:
+                hi = min(hi, self._guard_run(i, first)[j])
+            for cut in range(lo, hi + 1):
+                value = SeqView.window(base, k, k + cut)
+                yield from self.at(i + 1, j + cut, env.bind(first.name, value))
+            return
+
+        # 3) Non-spread element: match it against one target element and recurse on the rest
+        for env2 in _iter_pattern(first, base[k], env):
+            yield from self.at(i + 1, j + 1, env2)
+
+    def _guard_run(self, i: int, var: Var) -> list[int]:
+        """
+        For each target position j, the length of the longest run of elements starting at j
+        that `var` may bind (every element satisfying one and the same guard).
+        """
+        if i not in self.runs:
+            base, offset = self.base, self.offset
+            best = [0] * (self.size + 1)
+            for guard in var.guards:
+                run = 0
+                for j in range(self.size - 1, -1, -1):
+                    run = run + 1 if check_guard(guard, base[offset + j]) else 0
+                    best[j] = max(best[j], run)
+            self.runs[i] = best
+        return self.runs[i]
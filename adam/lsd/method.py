@@ -1,11 +1,14 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from typing import Any, Callable, Iterable, Optional
+from typing import TYPE_CHECKING, Any, Callable, Optional
 
-from .term import Node, Rule, Term, TermBase, Var
+from .term import LetterSeq, Node, Rule, Term, TermBase, Var
 from .util import check
 
+if TYPE_CHECKING:
+    from .env import Env
+
 
 @dataclass(frozen=True)
 class Method:
@@ -16,11 +19,14 @@ class Method:
         name (str): The name of the method.
         exec (Callable[..., Any]): The function that performs the transformation.
         cond (Callable[..., bool]): A condition that must be met for the method to apply (defaults to always True).
+        kernel (Callable[[LetterSeq], Any] | None): The transformation of a whole LetterSeq
+            at once, used instead of `exec` and `cond` when given one.
     """
 
     name: str
     exec: Callable[..., Any]
     cond: Callable[..., bool] = check.is_any  # Default condition is always true
+    kernel: Callable[[LetterSeq], Any] | None = None
 
     def __call__(self, arg: Any) -> TermBase | None:
         """
@@ -32,6 +38,8 @@ class Method:
         Returns:
             TermBase | None: The result of the transformation, or None if the condition fails.
         """
+        if self.kernel is not None and isinstance(arg, LetterSeq):
+            return self.kernel(arg)
         if not self.cond(arg):
             return None
         return self.exec(arg)
@@ -94,23 +102,16 @@ class MethodRule(Rule):
         """Return a string representing the name of the rule."""
         return f"MethodRule({self.method.name})"
 
-    def apply(self, term: Term) -> Optional[Term]:
+    def instantiate(self, env: Env) -> Optional[Term]:
         """
-        Apply the method to the matched term.
+        Run the method on the argument bound by a match.
 
         Args:
-            term (Term): The term to apply the rule to.
+            env (Env): The bindings from matching `pattern`.
 
         Returns:
-            Optional[Term]: The result of applying the method, or None if no match is found.
+            Optional[Term]: The method's result, or None if it does not apply.
         """
-        from lsd.match import match_pattern
-
-        # Match the term against the pattern
-        env = match_pattern(self.pattern, term)
-        if env is None:
-            return None
-
         # Get the value for the method's argument
         vals = env[self.var.name]
         arg = vals[0] if len(vals) == 1 else tuple(vals)
@@ -127,6 +128,32 @@ class MethodRule(Rule):
         return isinstance(other, MethodRule) and other.method.name == self.method.name
 
 
+# Whole-string kernels: each transforms every letter of a LetterSeq in one pass over its bytes.
+_SUCC = bytes(range(1, 256)) + b"\x00"
+_PRED = b"\xff" + bytes(range(255))
+
+
+def _succ_letters(s: LetterSeq) -> LetterSeq | None:
+    return None if 0xFF in s.data else LetterSeq(s.data.translate(_SUCC))
+
+
+def _pred_letters(s: LetterSeq) -> LetterSeq | None:
+    return None if 0 in s.data else LetterSeq(s.data.translate(_PRED))
+
+
+def _max_letter(s: LetterSeq) -> str | None:
+    return chr(max(s.data)) if s.data else None
+
+
+def _min_letter(s: LetterSeq) -> str | None:
+    return chr(min(s.data)) if s.data else None
+
+
+def _swap_first_last(s: LetterSeq) -> LetterSeq:
+    d = s.data
+    return LetterSeq(d[-1:] + d[1:-1] + d[:1]) if len(d) > 1 else s
+
+
 # Core Methods (no guards parameter; use cond for predicates)
 
 # Define various core methods like Pred, Succ, Max, Min, etc.
@@ -134,24 +161,28 @@ Pred = Method(
     name="Pred",
     exec=lambda x: chr(ord(x) - 1),
     cond=check.is_char,
+    kernel=_pred_letters,
 )
 
 Succ = Method(
     name="Succ",
     exec=lambda x: chr(ord(x) + 1),
     cond=check.is_char,
+    kernel=_succ_letters,
 )
 
 Max = Method(
     name="max",
     exec=lambda *xs: max(*xs),
     cond=check.is_iter,
+    kernel=_max_letter,
 )
 
 Min = Method(
     name="min",
     exec=lambda *xs: min(*xs),
     cond=check.is_iter,
+    kernel=_min_letter,
 )
 
 Identity = Method(
@@ -164,18 +195,21 @@ Reverse = Method(
     name="reverse",
     exec=lambda s: s[::-1],
     cond=check.is_any,
+    kernel=lambda s: LetterSeq(s.data[::-1]),
 )
 
 RotateRight1 = Method(
     name="rotate_right_1",
     exec=lambda s: s[-1] + s[:-1],
     cond=lambda _: True,
+    kernel=lambda s: LetterSeq(s.data[-1:] + s.data[:-1]),
 )
 
 SwapFirstLast = Method(
     name="swap_first_last",
     exec=lambda s: s[-1] + s[1:-1] + s[0] if len(s) > 1 else s,
     cond=lambda _: True,
+    kernel=_swap_first_last,
 )
 
 # Composed Methods
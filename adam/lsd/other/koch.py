@@ -14,7 +14,8 @@ def generate_koch_seq(steps: int, axiom: Seq = Seq("F")) -> Seq:
             TermRule("F", Seq(*"F+F-F-F+F")),
         ]
     )
-    seq = trs.rewrite(axiom, steps)
+    # Curve n is the axiom after n - 1 expansions.
+    seq = trs.rewrite(axiom, steps - 1)
     assert isinstance(seq, Seq)
     return seq
 
@@ -0,0 +1,128 @@
+"""
+Process-pool rewriting of the elements of large Seqs.
+
+A pass over a Seq rewrites each element independently, so for L-system style rule sets the
+elements can be split into contiguous chunks and rewritten in worker processes. Workers are
+forked from the engine, so they share its rules (including Methods wrapping lambdas) without
+pickling them. Only terms cross the process boundary, in the compact form produced by
+`lsd.flat.SymbolTable.encode`, and each worker sends back its fired steps so the engine can replay
+them into its trace in serial order.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import TYPE_CHECKING
+
+from .flat import SymbolTable
+from .term import Term
+from .trace import Trace
+
+if TYPE_CHECKING:
+    from .trs import TermRewriteSystem
+
+# Elements are split into roughly this many chunks per worker, to even out the load.
+CHUNKS_PER_WORKER = 4
+
+_engine: TermRewriteSystem | None = None
+_rule_ids: dict[int, int] = {}
+
+
+class ParallelRewriter:
+    """
+    Rewrites the elements of a Seq once each on a pool of forked worker processes, with
+    the same results and trace as `TermRewriteSystem._rewrite_child` applied in order.
+    """
+
+    def __init__(self, engine: TermRewriteSystem, workers: int):
+        self.engine = engine
+        self.workers = workers
+        self._pool: Executor | None = None
+        self._rules: list = []
+
+    @staticmethod
+    def available() -> bool:
+        """Workers must be forked to inherit the rules, which rules out some platforms."""
+        return "fork" in multiprocessing.get_all_start_methods()
+
+    def rewrite_all(self, elements: tuple) -> list[Term]:
+        engine = self.engine
+        results: list[Term] = list(elements)
+        # Elements already known to be normal stay put; only the rest are shipped out.
+        todo = [i for i, t in enumerate(elements) if not engine._is_marked(t)]
+        if not todo:
+            return results
+
+        base = None if engine._paths is None else tuple(engine._paths)
+        size = -(-len(todo) // (self.workers * CHUNKS_PER_WORKER))
+        chunks = [todo[i : i + size] for i in range(0, len(todo), size)]
+        payloads = []
+        for chunk in chunks:
+            table = SymbolTable()
+            codes = [table.encode(elements[i]) for i in chunk]
+            payloads.append((table.symbols, chunk, codes, base, engine.trace.keeps_terms))
+
+        for chunk, (symbols, outs, steps) in zip(chunks, self._pool_map(payloads)):
+            table = SymbolTable(symbols)
+            for i, code in zip(chunk, outs):
+                if code is None:
+                    engine._mark_normal(elements[i])
+                else:
+                    results[i] = engine._build(table.decode(code))
+            for rule_id, input, output, cost, path in steps:
+                if input is not None:
+                    input, output = table.decode(input), table.decode(output)
+                engine._replay(self._rules[rule_id], input, output, cost, path)
+        return results
+
+    def _pool_map(self, payloads: list) -> list:
+        if self._pool is None:
+            self._rules = list(self.engine._rules)
+            self._pool = ProcessPoolExecutor(
+                self.workers,
+                mp_context=multiprocessing.get_context("fork"),
+                initializer=_init_worker,
+                initargs=(self.engine,),
+            )
+        return list(self._pool.map(_rewrite_chunk, payloads))
+
+    def close(self) -> None:
+        """Stop the workers; they are forked again, with the current rules, when next needed."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+
+def _init_worker(engine: TermRewriteSystem) -> None:
+    global _engine, _rule_ids
+    engine.parallel = None
+    # Steps are shipped back whatever the engine's trace mode, which decides what to keep.
+    engine.trace = Trace()
+    _engine = engine
+    _rule_ids = {id(rule): i for i, rule in enumerate(engine._rules)}
+
+
+def _rewrite_chunk(payload: tuple) -> tuple[list, list, list]:
+    """Worker side: rewrite each element once; None marks an element nothing fired in."""
+    assert _engine is not None
+    symbols, indices, codes, base, keep_terms = payload
+    table = SymbolTable(symbols)
+    _engine.trace.clear()
+    outs = []
+    for index, code in zip(indices, codes):
+        # Steps carry their path from the root of the engine's pass, not from the element.
+        _engine._paths = None if base is None else [*base, index]
+        term = table.decode(code)
+        out = _engine._rewrite_subterm(term)
+        outs.append(None if out is term else table.encode(out))
+
+    if keep_terms:
+        steps = [
+            (_rule_ids[id(s.rule)], table.encode(s.input), table.encode(s.output), s.cost, s.path)
+            for s in _engine.trace
+        ]
+    else:
+        steps = [(_rule_ids[id(s.rule)], None, None, s.cost, s.path) for s in _engine.trace]
+    _engine.trace.clear()
+    return table.symbols, outs, steps
@@ -0,0 +1,105 @@
+"""
+Per-rule profiling for `TermRewriteSystem(profile=True)`.
+
+For every rule the engine tries, the profiler counts match attempts, successful matches and
+fires (a MethodRule can match and still decline), and splits the time spent into matching
+the pattern and building the result (substitution for a TermRule, `Method.exec` for a
+MethodRule). It also sums the sizes (see `lsd.budget.term_size`) of the terms each rule was
+tried on, to tell rules tried on whole strings from rules tried on single letters.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from time import perf_counter
+from typing import Optional
+
+from .term import Rule, Term
+from .util.print import print_table
+
+
+@dataclass
+class RuleStats:
+    rule: Rule
+    attempts: int = 0
+    matches: int = 0
+    fires: int = 0
+    # Seconds spent matching the pattern, and producing the result once it matched.
+    match_time: float = 0.0
+    build_time: float = 0.0
+    # Sum of the sizes of the terms the rule was tried on.
+    total_size: int = 0
+
+    @property
+    def mean_size(self) -> float:
+        return self.total_size / self.attempts if self.attempts else 0.0
+
+    @property
+    def time(self) -> float:
+        return self.match_time + self.build_time
+
+
+class Profiler:
+    """
+    Collects a `RuleStats` per rule, in the order the rules were first tried.
+
+    >>> from lsd.term import TermRule
+    >>> rule = TermRule("a", "b")
+    >>> profiler = Profiler()
+    >>> profiler.apply(rule, "a", 1), profiler.apply(rule, "c", 1)
+    ('b', None)
+    >>> stats = profiler.stats()[0]
+    >>> stats.attempts, stats.matches, stats.fires
+    (2, 1, 1)
+    """
+
+    __slots__ = ("_stats",)
+
+    def __init__(self):
+        self._stats: dict[int, RuleStats] = {}
+
+    def apply(self, rule: Rule, term: Term, size: int) -> Optional[Term]:
+        """`rule.apply(term)`, counted and timed; `size` is the size of `term`."""
+        stats = self._stats.get(id(rule))
+        if stats is None:
+            stats = self._stats[id(rule)] = RuleStats(rule)
+        stats.attempts += 1
+        stats.total_size += size
+
+        start = perf_counter()
+        env = rule.match(term)
+        matched = perf_counter()
+        stats.match_time += matched - start
+        if env is None:
+            return None
+
+        stats.matches += 1
+        out = rule.instantiate(env)
+        stats.build_time += perf_counter() - matched
+        if out is not None:
+            stats.fires += 1
+        return out
+
+    def stats(self) -> list[RuleStats]:
+        """A snapshot of the counters, unaffected by later rewriting."""
+        return [replace(stats) for stats in self._stats.values()]
+
+    def reset(self) -> None:
+        self._stats.clear()
+
+    def print(self) -> None:
+        """Print the counters as a table, most expensive rule first."""
+        rows = [
+            [
+                stats.rule.name(),
+                str(stats.attempts),
+                str(stats.matches),
+                str(stats.fires),
+                f"{stats.match_time * 1e3:.3f}",
+                f"{stats.build_time * 1e3:.3f}",
+                f"{stats.mean_size:.1f}",
+            ]
+            for stats in sorted(self._stats.values(), key=lambda s: s.time, reverse=True)
+        ]
+        headers = ["rule", "attempts", "matches", "fires", "match ms", "build ms", "mean size"]
+        print_table(rows, headers)
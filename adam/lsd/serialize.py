@@ -0,0 +1,331 @@
+"""
+A compact, versioned binary format for terms, TermRules and rewrite traces.
+
+Every value starts with a one-byte tag. Integers and lengths are varints (LEB128, with
+zigzag for signed integers). Each string, Node, Seq, Var and rule is written once; later
+occurrences of an equal value, with the same types all the way down (`Node("f", 1)` is not
+shared with `Node("f", True)`), are a back-reference to it. The strings thus form the symbol
+table, and a trace, where each step's output is the next one's input, stores every term
+only once. `dump_many` shares one table across a whole stream.
+
+MethodRules are written by method name and looked up again when loading, among the built-in
+Methods plus any passed as `methods`.
+
+>>> from lsd.parser import parse
+>>> rule = TermRule(parse("F[!X]"), parse("G[!X !X]"))
+>>> loads(dumps(rule)) == rule
+True
+"""
+
+from __future__ import annotations
+
+import io
+import struct
+from typing import IO, Any, Callable, Iterable, Iterator
+
+from .method import Method, MethodRule, get_methods
+from .term import LetterSeq, Node, Seq, Span, TermRule, Var, Wildcard
+from .trace import RewriteStep
+
+MAGIC = b"LSDB"
+VERSION = 1
+
+# Tags.
+(
+    NONE,
+    FALSE,
+    TRUE,
+    INT,
+    FLOAT,
+    STR,
+    TUPLE,
+    SEQ,
+    NODE,
+    VAR,
+    WILDCARD,
+    LETTERS,
+    TERM_RULE,
+    METHOD_RULE,
+    STEP,
+    TYPE,
+    REF,
+) = range(17)
+
+# Type guards a Var can carry, by name (the ones `lsd.parser.parse_guard` produces).
+_TYPES: dict[str, type] = {"int": int, "str": str, "float": float, "bool": bool}
+
+# Values written once and referred back to afterwards.
+_SHARED = (str, Seq, Node, tuple, Var, LetterSeq, TermRule, MethodRule)
+
+_DOUBLE = struct.Struct("<d")
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize a term, rule, RewriteStep, or a tuple or list (read back as a tuple) of them."""
+    out = bytearray(_header())
+    _Writer(out).write(obj)
+    return bytes(out)
+
+
+def loads(data: bytes, methods: Iterable[Method] = ()) -> Any:
+    stream = io.BytesIO(data)
+    _check_header(stream)
+    reader = _Reader(stream.read, methods)
+    obj = reader.read()
+    if stream.read(1):
+        raise ValueError("Trailing data after the serialized value")
+    return obj
+
+
+def dump_many(objs: Iterable[Any], file: IO[bytes]) -> None:
+    """Write `objs` to a binary file one after another, sharing repeated values."""
+    file.write(_header())
+    writer = _Writer(bytearray())
+    for obj in objs:
+        writer.write(obj)
+        file.write(writer.out)
+        writer.out.clear()
+
+
+def load_many(file: IO[bytes], methods: Iterable[Method] = ()) -> Iterator[Any]:
+    """Read back, lazily, the values written by `dump_many`."""
+    _check_header(file)
+    reader = _Reader(file.read, methods)
+    while True:
+        tag = file.read(1)
+        if not tag:
+            return
+        yield reader.read(tag[0])
+
+
+def _header() -> bytes:
+    return MAGIC + bytes([VERSION])
+
+
+def _check_header(file: IO[bytes]) -> None:
+    header = file.read(len(MAGIC) + 1)
+    if header[: len(MAGIC)] != MAGIC:
+        raise ValueError("Not an lsd binary file")
+    if header[-1] > VERSION:
+        raise ValueError(f"Format version {header[-1]} is newer than supported ({VERSION})")
+
+
+class _Writer:
+    __slots__ = ("out", "_refs", "_ids", "_count")
+
+    def __init__(self, out: bytearray):
+        self.out = out
+        # Index of each value written so far: by equality where hashable, else by identity.
+        # Values that are equal but differ in the types inside them share a key, so each key
+        # lists its (index, value) pairs.
+        self._refs: dict[tuple[type, Any], list[tuple[int, Any]]] = {}
+        self._ids: dict[int, tuple[int, Any]] = {}
+        self._count = 0
+
+    def write(self, obj: Any) -> None:
+        out = self.out
+        if obj is None:
+            out.append(NONE)
+        elif obj is False or obj is True:
+            out.append(TRUE if obj else FALSE)
+        elif type(obj) is int:
+            out.append(INT)
+            _varint(out, (obj << 1) if obj >= 0 else ((-obj << 1) - 1))
+        elif type(obj) is float:
+            out.append(FLOAT)
+            out += _DOUBLE.pack(obj)
+        elif isinstance(obj, _SHARED):
+            self._write_shared(obj)
+        elif isinstance(obj, list):
+            self._write_shared(tuple(obj))
+        elif isinstance(obj, Wildcard):
+            out.append(WILDCARD)
+        elif isinstance(obj, RewriteStep):
+            out.append(STEP)
+            for value in (obj.rule, obj.input, obj.output, obj.cost, obj.path):
+                self.write(value)
+        else:
+            raise TypeError(f"Cannot serialize {type(obj).__name__}: {obj!r}")
+
+    def _write_shared(self, obj: Any) -> None:
+        key = (type(obj), obj)
+        index = None
+        try:
+            entries = self._refs.get(key)
+        except TypeError:
+            key = None
+            entry = self._ids.get(id(obj))
+            index = None if entry is None else entry[0]
+        else:
+            for i, seen in entries or ():
+                if seen is obj or _identical(seen, obj):
+                    index = i
+                    break
+        if index is not None:
+            self.out.append(REF)
+            _varint(self.out, index)
+            return
+
+        self._write_value(obj)
+        index = self._count
+        self._count += 1
+        if key is not None:
+            self._refs.setdefault(key, []).append((index, obj))
+        else:
+            # Keep the object alive so its id is not reused while the writer lives.
+            self._ids[id(obj)] = (index, obj)
+
+    def _write_value(self, obj: Any) -> None:
+        out = self.out
+        if isinstance(obj, str):
+            data = obj.encode()
+            out.append(STR)
+            _varint(out, len(data))
+            out += data
+        elif isinstance(obj, LetterSeq):
+            out.append(LETTERS)
+            _varint(out, len(obj.data))
+            out += obj.data
+        elif isinstance(obj, tuple):
+            out.append(SEQ if isinstance(obj, Seq) else TUPLE)
+            _varint(out, len(obj))
+            for t in obj:
+                self.write(t)
+        elif isinstance(obj, Node):
+            out.append(NODE)
+            _varint(out, len(obj.body))
+            self.write(obj.head)
+            for t in obj.body:
+                self.write(t)
+        elif isinstance(obj, Var):
+            out.append(VAR)
+            self.write(obj.name)
+            _varint(out, obj.span.start)
+            _varint(out, 0 if obj.span.stop is None else obj.span.stop + 1)
+            _varint(out, len(obj.guards))
+            for guard in obj.guards:
+                self._write_guard(guard)
+        elif isinstance(obj, TermRule):
+            out.append(TERM_RULE)
+            self.write(obj.pattern)
+            self.write(obj.rhs)
+        else:
+            out.append(METHOD_RULE)
+            self.write(obj.method.name)
+
+    def _write_guard(self, guard: Any) -> None:
+        if isinstance(guard, str):
+            self.write(guard)
+            return
+        name = getattr(guard, "__name__", None)
+        if _TYPES.get(name) is not guard:  # type: ignore[arg-type]
+            raise TypeError(f"Cannot serialize guard {guard!r}")
+        self.out.append(TYPE)
+        self.write(name)
+
+
+class _Reader:
+    __slots__ = ("_read", "_refs", "_methods")
+
+    def __init__(self, read: Callable[[int], bytes], methods: Iterable[Method]):
+        self._read = read
+        self._refs: list[Any] = []
+        self._methods = {m.name: m for m in [*get_methods(), *methods]}
+
+    def read(self, tag: int | None = None) -> Any:
+        if tag is None:
+            tag = self._byte()
+        if tag == REF:
+            return self._refs[self._varint()]
+        if tag == NONE:
+            return None
+        if tag == FALSE or tag == TRUE:
+            return tag == TRUE
+        if tag == INT:
+            n = self._varint()
+            return (n >> 1) if not n & 1 else -((n + 1) >> 1)
+        if tag == FLOAT:
+            return _DOUBLE.unpack(self._exactly(8))[0]
+        if tag == WILDCARD:
+            return Wildcard()
+        if tag == STEP:
+            rule, input, output, cost, path = (self.read() for _ in range(5))
+            return RewriteStep(rule, input, output, cost, path)
+        obj = self._read_shared(tag)
+        self._refs.append(obj)
+        return obj
+
+    def _read_shared(self, tag: int) -> Any:
+        if tag == STR:
+            return self._exactly(self._varint()).decode()
+        if tag == LETTERS:
+            return LetterSeq(self._exactly(self._varint()))
+        if tag == SEQ:
+            return Seq(*(self.read() for _ in range(self._varint())))
+        if tag == TUPLE:
+            return tuple(self.read() for _ in range(self._varint()))
+        if tag == NODE:
+            n = self._varint()
+            head = self.read()
+            return Node(head, *(self.read() for _ in range(n)))
+        if tag == VAR:
+            name = self.read()
+            start, stop = self._varint(), self._varint()
+            guards = tuple(self._read_guard() for _ in range(self._varint()))
+            return Var(name, Span(start, None if stop == 0 else stop - 1), guards)
+        if tag == TERM_RULE:
+            pattern = self.read()
+            return TermRule(pattern, self.read())
+        if tag == METHOD_RULE:
+            name = self.read()
+            if name not in self._methods:
+                raise ValueError(f"Unknown method {name!r}; pass it to `methods`")
+            return MethodRule(self._methods[name])
+        raise ValueError(f"Corrupt data: unknown tag {tag}")
+
+    def _read_guard(self) -> Any:
+        tag = self._byte()
+        if tag == TYPE:
+            return _TYPES[self.read()]
+        return self.read(tag)
+
+    def _byte(self) -> int:
+        return self._exactly(1)[0]
+
+    def _exactly(self, n: int) -> bytes:
+        data = self._read(n)
+        if len(data) != n:
+            raise ValueError("Truncated data")
+        return data
+
+    def _varint(self) -> int:
+        result = shift = 0
+        while True:
+            byte = self._byte()
+            result |= (byte & 0x7F) << shift
+            if byte < 0x80:
+                return result
+            shift += 7
+
+
+def _identical(a: Any, b: Any) -> bool:
+    """Are two equal values also of the same types all the way down?"""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, Node):
+        return _identical(a.head, b.head) and _identical(a.body, b.body)
+    if isinstance(a, tuple):
+        return len(a) == len(b) and all(map(_identical, a, b))
+    if isinstance(a, TermRule):
+        return _identical(a.pattern, b.pattern) and _identical(a.rhs, b.rhs)
+    if isinstance(a, float):
+        # Tells 0.0 from -0.0.
+        return _DOUBLE.pack(a) == _DOUBLE.pack(b)
+    return a == b
+
+
+def _varint(out: bytearray, n: int) -> None:
+    while n >= 0x80:
+        out.append((n & 0x7F) | 0x80)
+        n >>= 7
+    out.append(n)
@@ -0,0 +1,428 @@
+"""
+Stratego-style strategy combinators over `lsd.term` terms.
+
+A strategy is applied to a term and either succeeds with a (possibly unchanged) term or fails
+with None. Leaves fire rules; combinators decide where and how often:
+
+    >>> from lsd.term import Node, TermRule
+    >>> inc = rules(TermRule("a", "b"), TermRule("b", "c"))
+    >>> topdown(try_(inc))(Node("F", "a", "b", "x"))
+    F(b, c, x)
+    >>> bottomup(repeat(inc))(Node("F", "a", "b"))
+    F(c, c)
+    >>> one(inc)(Node("F", "x", "a", "a"))
+    F(x, b, a)
+    >>> all_(inc)(Node("F", "a", "x")) is None
+    True
+
+A strategy that succeeds without changing anything returns the very same term object, so
+callers can detect a fixed point by identity.
+
+The constructor functions (`try_`, `repeat`, `then`, `choice`, ...) simplify as they build:
+nested sequences and choices are flattened, redundant `try_`/`repeat` wrappers collapse,
+and adjacent rule leaves in a choice are fused into one indexed `Rules` dispatch, so a
+choice between many rules costs a single lookup per visited subterm.
+
+Fusion stops there: one traversal is one walk, but a sequence of traversals such as
+`topdown(a) >> topdown(b)` walks the term once per traversal. Merging them into
+`topdown(a >> b)` would let `b` see a parent before `a` has rewritten its children, so the
+two are not equivalent in general; write the single traversal when that is what you mean.
+"""
+
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import Callable
+
+from .index import RuleIndex
+from .term import LetterSeq, Node, Rule, Seq, Term
+
+
+class Context:
+    """
+    The hooks through which strategies fire rules and build terms. Used as is, rules are
+    applied directly; `TermRewriteSystem` passes its own context so that fired steps are
+    traced and `engine_rules()` dispatches on the engine's rule set.
+    """
+
+    def apply_rule(self, rule: Rule, term: Term) -> Term | None:
+        return rule.apply(term)
+
+    def apply_rules(self, term: Term) -> Term | None:
+        """Fire the ambient rule set at `term`; standalone there is none, so this fails."""
+        return None
+
+    def build(self, term: Term) -> Term:
+        return term
+
+
+PLAIN = Context()
+
+
+class Strategy(ABC):
+    """Base class of all strategies. Compose with `>>` (sequence) and `|` (left choice)."""
+
+    __slots__ = ()
+
+    @abstractmethod
+    def __call__(self, term: Term, ctx: Context = PLAIN) -> Term | None:
+        """Apply the strategy to `term`: the (possibly unchanged) result, or None on failure."""
+        ...
+
+    def __rshift__(self, other: Strategy) -> Strategy:
+        return then(self, other)
+
+    def __or__(self, other: Strategy) -> Strategy:
+        return choice(self, other)
+
+    def __repr__(self) -> str:
+        return type(self).__name__
+
+
+class Id(Strategy):
+    """Always succeeds, leaving the term unchanged."""
+
+    __slots__ = ()
+
+    def __call__(self, term: Term, ctx: Context = PLAIN) -> Term | None:
+        return term
+
+
+class Fail(Strategy):
+    """Always fails."""
+
+    __slots__ = ()
+
+    def __call__(self, term: Term, ctx: Context = PLAIN) -> Term | None:
+        return None
+
+
+ID = Id()
+FAIL = Fail()
+
+
+class Rules(Strategy):
+    """Fire the first of `rules` (in the given order) that matches the term."""
+
+    __slots__ = ("rules", "_index")
+
+    def __init__(self, rules: tuple[Rule, ...]):
+        self.rules = rules
+        self._index = RuleIndex([rule.compile() for rule in rules])
+
+    def __call__(self, term: Term, ctx: Context = PLAIN) -> Term | None:
+        for rule in self._index.candidates(term):
+            out = ctx.apply_rule(rule, term)
+            if out is not None:
+                return out
+        return None
+
+    def __repr__(self) -> str:
+        return f"rules({', '.join(rule.name() for rule in self.rules)})"
+
+
+class EngineRules(Strategy):
+    """Fire the rule set of the `TermRewriteSystem` running the strategy."""
+
+    __slots__ = ()
+
+    def __call__(self, term: Term, ctx: Context = PLAIN) -> Term | None:
+        return ctx.apply_rules(term)
+
+    def __repr__(self) -> str:
+        return "engine_rules()"
+
+
+class Then(Strategy):
+    """Apply each strategy in turn to the previous result; fail if any of them fails."""
+
+    __slots__ = ("parts",)
+
+    def __init__(self, parts: tuple[Strategy, ...]):
+        self.parts = parts
+
+    def __call__(self, term: Term, ctx: Context = PLAIN) -> Term | None:
+        for s in self.parts:
+            term = s(term, ctx)  # type: ignore[assignment]
+            if term is None:
+                return None
+        return term
+
+    def __repr__(self) -> str:
+        return " >> ".join(map(repr, self.parts))
+
+
+class Choice(Strategy):
+    """Apply the first strategy that succeeds."""
+
+    __slots__ = ("parts",)
+
+    def __init__(self, parts: tuple[Strategy, ...]):
+        self.parts = parts
+
+    def __call__(self, term: Term, ctx: Context = PLAIN) -> Term | None:
+        for s in self.parts:
+            out = s(term, ctx)
+            if out is not None:
+                return out
+        return None
+
+    def __repr__(self) -> str:
+        return f"({' | '.join(map(repr, self.parts))})"
+
+
+class Try(Strategy):
+    """Apply `inner`, or leave the term unchanged if it fails."""
+
+    __slots__ = ("inner",)
+
+    def __init__(self, inner: Strategy):
+        self.inner = inner
+
+    def __call__(self, term: Term, ctx: Context = PLAIN) -> Term | None:
+        out = self.inner(term, ctx)
+        return term if out is None else out
+
+    def __repr__(self) -> str:
+        return f"try_({self.inner!r})"
+
+
+class Repeat(Strategy):
+    """
+    Apply `inner` until it fails or stops changing the term. Always succeeds.
+
+    Stratego's `repeat` only stops on failure; stopping on an unchanged result as well keeps
+    `repeat(try_(s))` from looping forever.
+    """
+
+    __slots__ = ("inner",)
+
+    def __init__(self, inner: Strategy):
+        self.inner = inner
+
+    def __call__(self, term: Term, ctx: Context = PLAIN) -> Term | None:
+        while True:
+            out = self.inner(term, ctx)
+            if out is None or out is term:
+                return term
+            term = out
+
+    def __repr__(self) -> str:
+        return f"repeat({self.inner!r})"
+
+
+class All(Strategy):
+    """Apply `inner` to every child; fail if it fails on any. Atoms succeed unchanged."""
+
+    __slots__ = ("inner",)
+
+    def __init__(self, inner: Strategy):
+        self.inner = inner
+
+    def __call__(self, term: Term, ctx: Context = PLAIN) -> Term | None:
+        args = children(term)
+        new_args = []
+        for arg in args:
+            out = self.inner(arg, ctx)
+            if out is None:
+                return None
+            new_args.append(out)
+        return rebuild(term, new_args, ctx.build)
+
+    def __repr__(self) -> str:
+        return f"all_({self.inner!r})"
+
+
+class One(Strategy):
+    """Apply `inner` to the leftmost child on which it succeeds; fail if there is none."""
+
+    __slots__ = ("inner",)
+
+    def __init__(self, inner: Strategy):
+        self.inner = inner
+
+    def __call__(self, term: Term, ctx: Context = PLAIN) -> Term | None:
+        args = children(term)
+        for i, arg in enumerate(args):
+            out = self.inner(arg, ctx)
+            if out is not None:
+                return rebuild(term, [*args[:i], out, *args[i + 1 :]], ctx.build)
+        return None
+
+    def __repr__(self) -> str:
+        return f"one({self.inner!r})"
+
+
+class TopDown(Strategy):
+    """Apply `inner` to the term, then (on success) to each child of the result, recursively."""
+
+    __slots__ = ("inner",)
+
+    def __init__(self, inner: Strategy):
+        self.inner = inner
+
+    def __call__(self, term: Term, ctx: Context = PLAIN) -> Term | None:
+        term = self.inner(term, ctx)  # type: ignore[assignment]
+        if term is None:
+            return None
+        new_args = []
+        for arg in children(term):
+            out = self(arg, ctx)
+            if out is None:
+                return None
+            new_args.append(out)
+        return rebuild(term, new_args, ctx.build)
+
+    def __repr__(self) -> str:
+        return f"topdown({self.inner!r})"
+
+
+class BottomUp(Strategy):
+    """Apply `inner` to every child recursively, then to the rebuilt term."""
+
+    __slots__ = ("inner",)
+
+    def __init__(self, inner: Strategy):
+        self.inner = inner
+
+    def __call__(self, term: Term, ctx: Context = PLAIN) -> Term | None:
+        new_args = []
+        for arg in children(term):
+            out = self(arg, ctx)
+            if out is None:
+                return None
+            new_args.append(out)
+        return self.inner(rebuild(term, new_args, ctx.build), ctx)
+
+    def __repr__(self) -> str:
+        return f"bottomup({self.inner!r})"
+
+
+def rules(*rs: Rule) -> Strategy:
+    """Fire the first matching rule among `rs`."""
+    return Rules(rs) if rs else FAIL
+
+
+def engine_rules() -> Strategy:
+    """Fire the running engine's own rules (fails outside a `TermRewriteSystem`)."""
+    return EngineRules()
+
+
+def then(*parts: Strategy) -> Strategy:
+    """Sequential composition: `then(a, b)` applies `a`, then `b` to its result."""
+    flat = [s for s in _flatten(parts, Then) if s is not ID]
+    if not flat:
+        return ID
+    return flat[0] if len(flat) == 1 else Then(tuple(flat))
+
+
+def choice(*parts: Strategy) -> Strategy:
+    """Left-biased choice: the result of the first of `parts` that succeeds."""
+    flat: list[Strategy] = []
+    for s in _flatten(parts, Choice):
+        if s is FAIL:
+            continue
+        if isinstance(s, Rules) and flat and isinstance(flat[-1], Rules):
+            flat[-1] = Rules(flat[-1].rules + s.rules)
+        else:
+            flat.append(s)
+        if not _can_fail(s):
+            # Nothing after an alternative that always succeeds can run.
+            break
+    if not flat:
+        return FAIL
+    return flat[0] if len(flat) == 1 else Choice(tuple(flat))
+
+
+def try_(s: Strategy) -> Strategy:
+    """Apply `s` if it succeeds, otherwise leave the term as is."""
+    if s is FAIL:
+        return ID
+    return Try(s) if _can_fail(s) else s
+
+
+def repeat(s: Strategy) -> Strategy:
+    """Apply `s` as long as it succeeds and changes the term."""
+    if isinstance(s, Try):
+        s = s.inner
+    if isinstance(s, Repeat) or s is ID:
+        return s
+    return Repeat(s)
+
+
+def all_(s: Strategy) -> Strategy:
+    """Apply `s` to every child of the term."""
+    return ID if s is ID else All(s)
+
+
+def one(s: Strategy) -> Strategy:
+    """Apply `s` to the leftmost child where it succeeds."""
+    return One(s)
+
+
+def topdown(s: Strategy) -> Strategy:
+    """Apply `s` at every position, parents before children."""
+    return ID if s is ID else TopDown(s)
+
+
+def bottomup(s: Strategy) -> Strategy:
+    """Apply `s` at every position, children before parents."""
+    return ID if s is ID else BottomUp(s)
+
+
+def _flatten(parts: tuple[Strategy, ...], kind: type[Then] | type[Choice]) -> list[Strategy]:
+    return [p for s in parts for p in (s.parts if isinstance(s, kind) else (s,))]
+
+
+def _can_fail(s: Strategy) -> bool:
+    """Might `s` fail? Only a conservative answer is needed: True when unsure."""
+    if isinstance(s, (Id, Try, Repeat)):
+        return False
+    if isinstance(s, (All, TopDown, BottomUp)):
+        return _can_fail(s.inner)
+    return True
+
+
+def children(term: Term) -> tuple:
+    """
+    The subterms strategies descend into: a Node's body, the elements of a Seq or
+    LetterSeq, or none.
+    """
+    if isinstance(term, Node):
+        return term.body
+    if isinstance(term, Seq):
+        return term
+    if isinstance(term, LetterSeq):
+        return term.to_seq()
+    return ()
+
+
+def rebuild(term: Term, new_args: list[Term], build: Callable[[Term], Term] = PLAIN.build) -> Term:
+    """
+    `term` with its children replaced by `new_args`, or `term` itself if none changed.
+    Seqs produced inside a Seq are spliced into it; new terms go through `build`. A changed
+    LetterSeq comes back as a plain Seq.
+    """
+    if isinstance(term, LetterSeq):
+        seq = term.to_seq()
+        out = rebuild(seq, new_args, build)
+        return term if out is seq else out
+    if isinstance(term, Node):
+        if all(new is old for new, old in zip(new_args, term.body)):
+            return term
+        return build(Node(term.head, *new_args))
+    if isinstance(term, Seq):
+        # Copy nothing up to the first change, and nothing at all if there is none.
+        for start, (old, new) in enumerate(zip(term, new_args)):
+            if new is not old or isinstance(new, Seq):
+                break
+        else:
+            return term
+        items: list[Term] = list(term[:start])
+        for new in new_args[start:]:
+            if isinstance(new, Seq):
+                items.extend(new)
+            else:
+                items.append(new)
+        return build(Seq(*items))
+    return term
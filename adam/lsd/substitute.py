@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+from typing import Any, Callable, Iterable
+
 from .env import Env
 from .term import Node, Seq, Term, Var
 
+type Builder = Callable[[Env], Term]
+type SeqBuilder = Callable[[Env], Seq]
+
 
 def substitute(term: Term, env: Env) -> Term:
     """
@@ -64,3 +69,134 @@ def substitute_seq(term: Seq, env: Env) -> Seq:
         else:
             result.append(substitute(t, env))
     return Seq(*result)
+
+
+def compile_template(template: Term, bound: Iterable[str] | None = None) -> Builder:
+    """
+    Compile `template` into a builder equivalent to `lambda env: substitute(template, env)`.
+
+    Variable-free subterms are built once, here, and every call returns those same objects.
+    A Seq is assembled in one pass, splicing spread bindings straight into the result.
+
+    If `bound` is given (the names of the variables a match is certain to bind, see
+    `variables`), a variable the builder could never fill raises ValueError now instead of
+    KeyError on every call. Only optional variables inside a Seq may be left out of `bound`.
+
+    >>> from lsd.parser import parse
+    >>> build = compile_template(parse("F[G[a] !X]"), bound={"X"})
+    >>> out = build(Env(X=("b",)))
+    >>> out, out.body[0] is build(Env(X=("c",))).body[0]
+    (F(G(a), b), True)
+    >>> compile_template(parse("F[!Y]"), bound={"X"})
+    Traceback (most recent call last):
+        ...
+    ValueError: Template F(Var.!Y) uses Y, which the pattern does not bind
+    """
+    if bound is not None:
+        names = frozenset(bound)
+        for var in _unbindable(template, names):
+            raise ValueError(
+                f"Template {template} uses {var.name}, which the pattern does not bind"
+            )
+    return _compile(template)
+
+
+def variables(term: Term) -> set[str]:
+    """The names of the variables in `term`."""
+    if isinstance(term, Var):
+        return {term.name}
+    if isinstance(term, Node):
+        return variables(term.head) | variables(term.body)
+    if isinstance(term, tuple):
+        return set().union(*map(variables, term))
+    return set()
+
+
+def _unbindable(term: Term, bound: frozenset[str], in_seq: bool = False) -> Iterable[Var]:
+    if isinstance(term, Var):
+        if term.name not in bound and not (in_seq and term.is_optional):
+            yield term
+    elif isinstance(term, Node):
+        yield from _unbindable(term.head, bound)
+        yield from _unbindable(term.body, bound)
+    elif isinstance(term, Seq):
+        for t in term:
+            yield from _unbindable(t, bound, in_seq=True)
+
+
+def _compile(template: Term) -> Builder:
+    if not variables(template):
+        return _compile_constant(template)
+    if isinstance(template, Var):
+        return lambda env: substitute_var(template, env)
+    if isinstance(template, Seq):
+        return _compile_seq(template)
+    if isinstance(template, Node):
+        return _compile_node(template)
+    return _compile_constant(template)
+
+
+def _compile_constant(template: Term) -> Builder:
+    # `substitute` would rebuild Nodes and Seqs; terms are immutable, so one copy serves all.
+    value = substitute(template, Env())
+
+    def build_constant(env: Env) -> Term:
+        return value
+
+    return build_constant
+
+
+# Steps of a compiled Seq: extend the result with a run of constant elements, splice a
+# variable's binding, or append one built element.
+_RUN, _SPLICE, _BUILD = range(3)
+
+
+def _compile_seq(template: Seq) -> SeqBuilder:
+    steps: list[tuple[int, Any]] = []
+    run: list[Term] = []
+    for t in template:
+        if not isinstance(t, Var) and not variables(t):
+            run.append(substitute(t, Env()))
+            continue
+        if run:
+            steps.append((_RUN, tuple(run)))
+            run = []
+        if isinstance(t, Var):
+            steps.append((_SPLICE, t))
+        else:
+            steps.append((_BUILD, _compile(t)))
+    if run:
+        steps.append((_RUN, tuple(run)))
+
+    def build_seq(env: Env) -> Seq:
+        result: list[Term] = []
+        for kind, arg in steps:
+            if kind == _SPLICE:
+                if bound := env.get(arg.name):
+                    result.extend(bound)
+                elif not arg.is_optional:
+                    raise KeyError(f"Unbound variable: {arg.name}")
+            elif kind == _RUN:
+                result.extend(arg)
+            else:
+                result.append(arg(env))
+        return tuple.__new__(Seq, result)
+
+    return build_seq
+
+
+def _compile_node(template: Node) -> Builder:
+    head = template.head
+    build_body = _compile_seq(template.body)
+
+    if isinstance(head, Var):
+
+        def build_var_node(env: Env) -> Node:
+            return Node(substitute_var(head, env), *build_body(env))
+
+        return build_var_node
+
+    def build_node(env: Env) -> Node:
+        return Node(head, *build_body(env))
+
+    return build_node
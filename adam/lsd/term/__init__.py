@@ -1,6 +1,9 @@
+from .intern import InternTable
+from .letters import LetterSeq
 from .node import Node
+from .rope import Rope
 from .rule import Rule, TermRule
-from .seq import Seq
+from .seq import Seq, SeqView
 from .term import Term, TermBase
 from .types import Guard
 from .var import Span, Var, check_guard
@@ -0,0 +1,103 @@
+from __future__ import annotations
+
+import sys
+from typing import Any
+from weakref import WeakValueDictionary
+
+from .node import Node
+from .seq import Seq
+from .term import Term
+
+# Seqs the table holds before it starts over; see `InternTable`.
+SEQ_LIMIT = 1 << 16
+
+
+class InternTable:
+    """
+    A hash-consing table: structurally equal terms interned through the same table are the
+    same object, so memory grows with the number of distinct subterms rather than with the
+    total size of the terms built.
+
+    Nodes are held weakly and disappear from the table once nothing else refers to them; a
+    Node's body needs no entry of its own, since it is shared exactly when the Node is.
+    Tuples (and so Seqs) cannot be weakly referenced, so Seqs interned in their own right
+    are held strongly instead, at most `SEQ_LIMIT` of them: past that the Seq table starts
+    over, which only costs sharing with the Seqs it forgot. String atoms go through
+    `sys.intern`.
+
+    >>> table = InternTable()
+    >>> a = table.intern(Node("f", Node("g", "x"), Seq("y")))
+    >>> b = table.node("f", table.node("g", "x"), table.seq("y"))
+    >>> a is b, a.body[0] is b.body[0]
+    (True, True)
+    """
+
+    def __init__(self):
+        self._nodes: WeakValueDictionary[tuple, Node] = WeakValueDictionary()
+        self._seqs: dict[Seq, Seq] = {}
+        # Marks the Nodes made canonical here; replaced by `clear()`, since Nodes canonical
+        # before it are not shared with those made after.
+        self._token = object()
+
+    def intern(self, term: Term | Any) -> Term | Any:
+        """Return the canonical copy of `term`, interning all of its subterms."""
+        if isinstance(term, Node):
+            if term._owner is self._token:
+                return term
+            return self._node(term.head, term.body, term)
+        if isinstance(term, Seq):
+            return self._seq(tuple(map(self.intern, term)), term)
+        if isinstance(term, str):
+            return sys.intern(term)
+        return term
+
+    def node(self, head: Term, *body: Term) -> Node:
+        """Build (or find) the canonical `Node(head, *body)`."""
+        return self._node(head, body, None)
+
+    def seq(self, *values: Term) -> Seq:
+        """Build (or find) the canonical `Seq(*values)`."""
+        return self._seq(tuple(map(self.intern, values)), None)
+
+    def symbol(self, name: str) -> str:
+        """The canonical copy of a string atom."""
+        return sys.intern(name)
+
+    def _node(self, head: Term, body: tuple, original: Node | None) -> Node:
+        head = self.intern(head)
+        body_seq = Seq(*map(self.intern, body))
+        key = (head, body_seq)
+        try:
+            found = self._nodes.get(key)
+        except TypeError:
+            return original if original is not None else Node(head, *body_seq)
+        if found is not None:
+            return found
+        node = Node(head, *body_seq)
+        object.__setattr__(node, "body", body_seq)
+        object.__setattr__(node, "_owner", self._token)
+        self._nodes[key] = node
+        return node
+
+    def _seq(self, values: tuple, original: Seq | None) -> Seq:
+        candidate = original if original is not None else Seq(*values)
+        try:
+            found = self._seqs.get(candidate)
+        except TypeError:
+            return candidate
+        if found is not None:
+            return found
+        canonical = Seq(*values)
+        if len(self._seqs) >= SEQ_LIMIT:
+            self._seqs.clear()
+        self._seqs[canonical] = canonical
+        return canonical
+
+    def clear(self) -> None:
+        """Forget every canonical term."""
+        self._nodes.clear()
+        self._seqs.clear()
+        self._token = object()
+
+    def __len__(self) -> int:
+        return len(self._nodes) + len(self._seqs)
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from typing import Any, Iterable, Iterator
+
+from .seq import Seq, SeqView
+from .term import TermBase
+
+_ENCODING = "latin-1"
+
+
+class LetterSeq(TermBase):
+    """
+    A letter string packed one byte per letter (Latin-1), for whole-string Methods.
+
+    It compares and hashes equal to the Seq of its one-character strings, and Seq patterns
+    match it as if it were that Seq. Converting from and to `str` is a single encode or
+    decode; converting to a Seq reuses Python's cached one-character strings.
+
+    >>> letters = LetterSeq("abc")
+    >>> letters == Seq("a", "b", "c"), len(letters), letters[1]
+    (True, 3, 'b')
+    >>> letters.to_seq(), str(letters[::-1])
+    (Seq(a, b, c), 'cba')
+    """
+
+    __slots__ = ("data", "_hash")
+
+    data: bytes
+    _hash: int | None
+
+    def __init__(self, letters: str | bytes | Iterable[str] = b""):
+        if isinstance(letters, bytes):
+            data = letters
+        elif isinstance(letters, str):
+            data = letters.encode(_ENCODING)
+        else:
+            data = LetterSeq.from_seq(letters).data
+        object.__setattr__(self, "data", data)
+        object.__setattr__(self, "_hash", None)
+
+    @classmethod
+    def from_seq(cls, seq: Iterable[str]) -> LetterSeq:
+        """Pack a sequence of one-character strings; raises ValueError for anything else."""
+        items = tuple(seq)
+        try:
+            text = "".join(items)
+        except TypeError:
+            raise ValueError(f"Not a letter string: {items!r}") from None
+        if len(text) != len(items):
+            raise ValueError(f"Not a letter string: {items!r}")
+        try:
+            return cls(text.encode(_ENCODING))
+        except UnicodeEncodeError:
+            raise ValueError(f"Letters outside Latin-1: {text!r}") from None
+
+    def to_seq(self) -> Seq:
+        return tuple.__new__(Seq, self.data.decode(_ENCODING))
+
+    def __str__(self) -> str:
+        return self.data.decode(_ENCODING)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"LetterSeq is immutable; cannot set {name!r}")
+
+    def __reduce__(self):
+        return (LetterSeq, (self.data,))
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return LetterSeq(self.data[index])
+        return chr(self.data[index])
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.data.decode(_ENCODING))
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if isinstance(other, LetterSeq):
+            return self.data == other.data
+        if isinstance(other, (tuple, SeqView)):
+            return len(other) == len(self.data) and self.to_seq() == other
+        return False
+
+    def __hash__(self) -> int:
+        # Equal to the hash of the Seq with the same letters.
+        if self._hash is None:
+            object.__setattr__(self, "_hash", hash(self.to_seq()))
+        return self._hash  # type: ignore[return-value]
+
+    def __repr__(self) -> str:
+        return f"LetterSeq({str(self)!r})"
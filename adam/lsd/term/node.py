@@ -1,3 +1,5 @@
+from typing import Any
+
 from .seq import Seq
 from .term import Term, TermBase
 
@@ -5,16 +7,59 @@ from .term import Term, TermBase
 class Node(TermBase):
     """
     Represents a function or operation with a head and variadic body.
+
+    Nodes are immutable, keep their fields in slots and hash once, at construction, so they
+    can key dicts and memo tables cheaply. A Node that contains something unhashable is
+    still a valid term, just not usable as a key.
+
+    `_owner` marks the `InternTable` that made this Node canonical, if any. Two distinct
+    Nodes canonical in the same table are never equal, so equality between them is an
+    identity check.
     """
 
+    __slots__ = ("head", "body", "_hash", "_owner", "__weakref__")
     __match_args__ = ("head", "body")
 
+    head: Term
+    body: Seq
+    _hash: int | None
+    _owner: object | None
+
     def __init__(self, head: Term, *body: Term):
-        self.head = head
-        self.body = Seq(*body)
+        body_seq = Seq(*body)
+        object.__setattr__(self, "head", head)
+        object.__setattr__(self, "body", body_seq)
+        try:
+            h = hash((Node, head, body_seq))
+        except TypeError:
+            h = None
+        object.__setattr__(self, "_hash", h)
+        object.__setattr__(self, "_owner", None)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"Node is immutable; cannot set {name!r}")
+
+    def __delattr__(self, name: str):
+        raise AttributeError(f"Node is immutable; cannot delete {name!r}")
+
+    def __reduce__(self):
+        return (Node, (self.head, *self.body))
 
     def __repr__(self):
         return f"{self.head}({', '.join(map(str, self.body))})"
 
     def __eq__(self, other):
-        return isinstance(other, Node) and self.head == other.head and self.body == other.body
+        if self is other:
+            return True
+        if not isinstance(other, Node):
+            return False
+        if self._hash != other._hash:
+            return False
+        if self._owner is not None and self._owner is other._owner:
+            return False
+        return self.head == other.head and self.body == other.body
+
+    def __hash__(self):
+        if self._hash is None:
+            raise TypeError(f"unhashable Node: {self!r}")
+        return self._hash
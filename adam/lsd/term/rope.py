@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+from itertools import chain, islice
+from typing import Any, Iterable, Iterator
+
+from .seq import Seq, SeqView
+from .term import Term
+
+# Elements per leaf; shorter runs are merged into one leaf when ropes are joined.
+LEAF_SIZE = 64
+
+
+class Rope:
+    """
+    A long sequence of terms as a persistent balanced (AVL) tree of tuple leaves.
+
+    Reads like a Seq (length, indexing, slicing, iteration, equality), but concatenating,
+    splitting and splicing build a new rope in O(log n), sharing everything else with the
+    old one. `to_seq` turns it back into a Seq in one O(n) copy.
+
+    >>> rope = Rope.of("abcdef")
+    >>> rope = rope.splice(2, 3, "XYZ")
+    >>> len(rope), rope[2], rope[5]
+    (8, 'X', 'd')
+    >>> rope.to_seq()
+    Seq(a, b, X, Y, Z, d, e, f)
+    >>> rope[1:4] == Seq("b", "X", "Y")
+    True
+    """
+
+    __slots__ = ("left", "right", "leaf", "size", "height")
+
+    left: Rope | None
+    right: Rope | None
+    leaf: tuple | None
+    size: int
+    height: int
+
+    @classmethod
+    def of(cls, items: Iterable[Term]) -> Rope:
+        """A balanced rope holding `items`."""
+        items = tuple(items)
+        level = [_leaf(items[i : i + LEAF_SIZE]) for i in range(0, len(items), LEAF_SIZE)]
+        if not level:
+            return EMPTY
+        while len(level) > 1:
+            pairs = [_node(level[i], level[i + 1]) for i in range(0, len(level) - 1, 2)]
+            if len(level) % 2:
+                pairs[-1] = _join(pairs[-1], level[-1])
+            level = pairs
+        return level[0]
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.size)
+            if step != 1:
+                return Rope.of(tuple(self)[index])
+            return self.split(max(start, stop))[0].split(start)[1]
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("Rope index out of range")
+        node = self
+        while node.leaf is None:
+            left = node.left
+            assert left is not None and node.right is not None
+            if index < left.size:
+                node = left
+            else:
+                index -= left.size
+                node = node.right
+        return node.leaf[index]
+
+    def __iter__(self) -> Iterator[Term]:
+        return chain.from_iterable(self.leaves())
+
+    def iter_from(self, start: int) -> Iterator[Term]:
+        """Iterate from `self[start]` on, in O(log n) plus the elements visited."""
+        if start <= 0:
+            return iter(self)
+        return iter(self.split(start)[1])
+
+    def leaves(self) -> Iterator[tuple]:
+        """The leaf tuples, left to right."""
+        stack: list[Rope] = [self]
+        while stack:
+            node = stack.pop()
+            if node.leaf is not None:
+                if node.leaf:
+                    yield node.leaf
+                continue
+            left, right = node.left, node.right
+            assert left is not None and right is not None
+            stack.append(right)
+            stack.append(left)
+
+    def split(self, index: int) -> tuple[Rope, Rope]:
+        """`(self[:index], self[index:])`."""
+        if index <= 0:
+            return EMPTY, self
+        if index >= self.size:
+            return self, EMPTY
+        if self.leaf is not None:
+            return _leaf(self.leaf[:index]), _leaf(self.leaf[index:])
+        left, right = self.left, self.right
+        assert left is not None and right is not None
+        if index < left.size:
+            a, b = left.split(index)
+            return a, _join(b, right)
+        if index == left.size:
+            return left, right
+        a, b = right.split(index - left.size)
+        return _join(left, a), b
+
+    def concat(self, other: Rope) -> Rope:
+        return _join(self, other)
+
+    def __add__(self, other: Rope | Iterable[Term]) -> Rope:
+        return _join(self, other if isinstance(other, Rope) else Rope.of(other))
+
+    def splice(self, start: int, stop: int, items: Iterable[Term]) -> Rope:
+        """`self` with `self[start:stop]` replaced by `items`."""
+        left, rest = self.split(start)
+        right = rest.split(stop - start)[1]
+        return _join(_join(left, Rope.of(items)), right)
+
+    def to_seq(self) -> Seq:
+        return tuple.__new__(Seq, iter(self))
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if not isinstance(other, (tuple, SeqView, Rope)) or len(other) != self.size:
+            return False
+        return all(a == b for a, b in zip(self, other))
+
+    def __hash__(self) -> int:
+        # Equal to the hash of the Seq (or tuple) with the same elements.
+        return hash(tuple(self))
+
+    def __repr__(self) -> str:
+        shown = ", ".join(map(str, islice(self, 20)))
+        return f"Rope({shown}{', ...' if self.size > 20 else ''})"
+
+
+def _leaf(items: tuple) -> Rope:
+    rope = object.__new__(Rope)
+    rope.left = rope.right = None
+    rope.leaf = items
+    rope.size = len(items)
+    rope.height = 0
+    return rope
+
+
+def _node(left: Rope, right: Rope) -> Rope:
+    rope = object.__new__(Rope)
+    rope.left = left
+    rope.right = right
+    rope.leaf = None
+    rope.size = left.size + right.size
+    rope.height = max(left.height, right.height) + 1
+    return rope
+
+
+def _join(left: Rope, right: Rope) -> Rope:
+    """Concatenate two balanced ropes into a balanced rope, in O(height difference)."""
+    if not left.size:
+        return right
+    if not right.size:
+        return left
+    if left.leaf is not None and right.leaf is not None and left.size + right.size <= LEAF_SIZE:
+        return _leaf(left.leaf + right.leaf)
+    if left.height > right.height + 1:
+        assert left.left is not None and left.right is not None
+        return _balance(left.left, _join(left.right, right))
+    if right.height > left.height + 1:
+        assert right.left is not None and right.right is not None
+        return _balance(_join(left, right.left), right.right)
+    return _node(left, right)
+
+
+def _balance(left: Rope, right: Rope) -> Rope:
+    """`_node(left, right)`, rotated back into balance if one side is two levels deeper."""
+    if left.height > right.height + 1:
+        a, b = left.left, left.right
+        assert a is not None and b is not None
+        if a.height >= b.height:
+            return _node(a, _node(b, right))
+        assert b.left is not None and b.right is not None
+        return _node(_node(a, b.left), _node(b.right, right))
+    if right.height > left.height + 1:
+        a, b = right.left, right.right
+        assert a is not None and b is not None
+        if b.height >= a.height:
+            return _node(_node(left, a), b)
+        assert a.left is not None and a.right is not None
+        return _node(_node(left, a.left), _node(a.right, b))
+    return _node(left, right)
+
+
+EMPTY = _leaf(())
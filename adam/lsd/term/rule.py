@@ -2,12 +2,16 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
+from functools import cached_property
 from logging import getLogger
-from typing import Any, Optional, Union
+from typing import TYPE_CHECKING, Any, Optional
 
-from .node import Node
 from .term import Term, TermBase
-from .var import Var
+
+if TYPE_CHECKING:
+    from lsd.compile import Matcher
+    from lsd.env import Env
+    from lsd.substitute import Builder
 
 logger = getLogger(__name__)
 
@@ -15,20 +19,48 @@ logger = getLogger(__name__)
 class Rule(ABC, TermBase):
     """
     A rewrite rule: if lhs matches a term, produce rhs (or computed) result.
+
+    Firing is split in two steps, `match` and `instantiate`, which `apply` runs in turn.
     """
 
     pattern: Term
 
-    @abstractmethod
     def apply(self, term: Term) -> Optional[Term]:
         """Try to apply this rule to `term`. Return the rewritten Term or None."""
-        ...
+        env = self.match(term)
+        return None if env is None else self.instantiate(env)
 
     @abstractmethod
     def name(self) -> str:
         """A human‑readable name for this rule."""
         ...
 
+    @cached_property
+    def matcher(self) -> Matcher:
+        """`pattern` compiled into a specialized matcher (see `lsd.compile`)."""
+        from lsd.compile import compile_pattern
+
+        return compile_pattern(self.pattern)
+
+    def match(self, term: Term) -> Optional[Env]:
+        """The bindings under which `pattern` matches `term`, or None."""
+        from lsd.env import Env
+
+        return self.matcher(term, Env())
+
+    @abstractmethod
+    def instantiate(self, env: Env) -> Optional[Term]:
+        """
+        The result of firing on a term that matched with bindings `env`, or None if the rule
+        declines it after all.
+        """
+        ...
+
+    def compile(self) -> Rule:
+        """Compile the pattern now rather than on first use; returns self."""
+        self.matcher
+        return self
+
     def __repr__(self) -> str:
         return self.name()
 
@@ -46,15 +78,30 @@ class TermRule(Rule, TermBase):
         return f"Rule({self.pattern} → {self.rhs})"
 
     def apply(self, term: Term) -> Optional[Term]:
-        from lsd.match import match_pattern
-        from lsd.method import Method
-        from lsd.substitute import substitute
-
-        env = match_pattern(self.pattern, term)
+        env = self.match(term)
         if env is None:
             return None
         logger.debug("Applying %s to %r → %r", self.name(), term, self.rhs)
-        return substitute(self.rhs, env)
+        return self.instantiate(env)
+
+    def instantiate(self, env: Env) -> Term:
+        return self.builder(env)
+
+    @cached_property
+    def builder(self) -> Builder:
+        """
+        `rhs` compiled into a builder (see `lsd.substitute.compile_template`). Compiling
+        raises ValueError if `rhs` uses a variable that `pattern` does not bind.
+        """
+        from lsd.substitute import compile_template, variables
+
+        return compile_template(self.rhs, bound=variables(self.pattern))
+
+    def compile(self) -> TermRule:
+        """Compile the pattern and the rhs now rather than on first use; returns self."""
+        super().compile()
+        self.builder
+        return self
 
     def __eq__(self, other: Any) -> bool:
         return (
@@ -9,27 +9,35 @@ class Seq(tuple, TermBase):
     """
     A symbolic sequence of terms.
 
+    Seqs are immutable and carry no per-instance `__dict__`. Equality and hashing go
+    straight to the tuple implementation, which compares element identity first and never
+    copies; element Nodes and Vars bring their own cached hashes.
+
     >>> Seq('a', 123)
     Seq(a, 123)
     """
 
+    __slots__ = ()
+
     def __new__(cls, *values: Term):
         return tuple.__new__(Seq, values)
 
+    def __getnewargs__(self):
+        return tuple(self)
+
     def __repr__(self):
         return f"Seq({', '.join(map(str, self))})"
 
     def __eq__(self, other):
-        return isinstance(other, (tuple, Seq)) and tuple(self) == tuple(other)
-
-    def __hash__(self):
-        return hash(tuple(self))
-
-    def __len__(self):
-        return tuple.__len__(self)
+        if self is other:
+            return True
+        if isinstance(other, tuple):
+            return tuple.__eq__(self, other)
+        if isinstance(other, SeqView):
+            return other == self
+        return NotImplemented
 
-    def __getitem__(self, index):
-        return tuple.__getitem__(self, index)
+    __hash__ = tuple.__hash__
 
     @classmethod
     def ensure(cls, value: Any) -> Seq:
@@ -38,3 +46,84 @@ class Seq(tuple, TermBase):
         if isinstance(value, tuple):
             return Seq(*value)
         return Seq(value)
+
+    def view(self, start: int = 0, stop: int | None = None) -> SeqView:
+        """A zero-copy window onto `self[start:stop]`."""
+        return SeqView(self, start, stop)
+
+
+class SeqView:
+    """
+    A read-only window `base[start:stop]` onto a Seq that shares the underlying storage.
+
+    Matching walks sequences by position, so it can run against a view of a long Seq
+    without copying any of it; a real tuple is only built (`materialize`) when a spread
+    variable is bound to part of the window.
+
+    >>> v = Seq(*"abcdef").view(1, 4)
+    >>> len(v), v[0], v[-1]
+    (3, 'b', 'd')
+    >>> v[1:].materialize()
+    ('c', 'd')
+    >>> v == ("b", "c", "d")
+    True
+    """
+
+    __slots__ = ("base", "start", "stop")
+
+    base: tuple
+    start: int
+    stop: int
+
+    def __init__(self, base: tuple | SeqView, start: int = 0, stop: int | None = None):
+        size = len(base)
+        start, stop, _ = slice(start, stop).indices(size)
+        stop = max(start, stop)
+        if isinstance(base, SeqView):
+            start, stop, base = base.start + start, base.start + stop, base.base
+        self.base = base
+        self.start = start
+        self.stop = stop
+
+    @classmethod
+    def window(cls, base: tuple, start: int, stop: int) -> SeqView:
+        """Build a view from already-normalized bounds (0 <= start <= stop <= len(base))."""
+        view = object.__new__(cls)
+        view.base = base
+        view.start = start
+        view.stop = stop
+        return view
+
+    def __len__(self) -> int:
+        return self.stop - self.start
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            if index.step not in (None, 1):
+                return self.materialize()[index]
+            return SeqView(self, index.start or 0, index.stop)
+        size = self.stop - self.start
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError("SeqView index out of range")
+        return self.base[self.start + index]
+
+    def __iter__(self):
+        base = self.base
+        return (base[i] for i in range(self.start, self.stop))
+
+    def __eq__(self, other):
+        if not isinstance(other, (tuple, SeqView)) or len(other) != len(self):
+            return False
+        return all(a == b for a, b in zip(self, other))
+
+    def __hash__(self):
+        return hash(self.materialize())
+
+    def __repr__(self):
+        return f"SeqView({', '.join(map(str, self))})"
+
+    def materialize(self) -> tuple:
+        """Copy the window out as a plain tuple."""
+        return tuple.__getitem__(self.base, slice(self.start, self.stop))
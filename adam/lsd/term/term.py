@@ -1,4 +1,5 @@
-class TermBase: ...
+class TermBase:
+    __slots__ = ()
 
 
 type Term = int | str | float | TermBase | tuple["Term", ...]
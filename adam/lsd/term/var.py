@@ -4,7 +4,7 @@ from dataclasses import dataclass, field
 from typing import Any, NamedTuple, Optional, Protocol, Type, Union
 
 from .node import Node
-from .seq import Seq
+from .seq import SeqView
 from .term import TermBase
 from .types import Guard
 
@@ -34,18 +34,38 @@ class Span(NamedTuple):
             i += 1
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True, eq=False)
 class Var(TermBase):
     """
     Args:
     - name: The name of the variable; determines binding.
     - span: Determines how many values may be bound to variable.
             Default: Span(lo=1, hi=1) matches precisely one value.
+    - guards: Types or Node heads the bound values must have.
     """
 
     name: str
     span: Span = field(default=Span(1, 1))
     guards: tuple[Guard, ...] = field(default=())
+    _hash: int = field(init=False, repr=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "_hash", hash((Var, self.name, self.span, self.guards)))
+
+    def __eq__(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if other.__class__ is not Var:
+            return NotImplemented
+        return (
+            self._hash == other._hash
+            and self.name == other.name
+            and self.span == other.span
+            and self.guards == other.guards
+        )
+
+    def __hash__(self) -> int:
+        return self._hash
 
     @property
     def is_optional(self) -> bool:
@@ -109,7 +129,7 @@ class Var(TermBase):
 
 
 def check_guard(guard: Guard, value) -> bool:
-    if isinstance(value, (tuple, Seq)):
+    if isinstance(value, (tuple, SeqView)):
         return all(check_guard(guard, v) for v in value)
     elif isinstance(guard, str):
         return isinstance(value, Node) and value.head == guard
@@ -2,11 +2,13 @@ from .term import TermBase
 
 
 class Wildcard(TermBase):
+    __slots__ = ()
+
     def __str__(self):
         return "_"
 
     def __eq__(self, other):
-        return isinstance(other, Wildcard)
+        return self is other or isinstance(other, Wildcard)
 
     def __hash__(self):
         return hash("_")
@@ -0,0 +1,211 @@
+"""
+Recording of the rewrite steps a `TermRewriteSystem` fires.
+
+Keeping every step (the default) keeps every intermediate term alive, so long runs can pick
+a bounded mode instead:
+
+- full: every step, in order.
+- compact: every step, as (rule id, redex path, redex) only; the output of a step is
+  recomputed by re-applying its rule when the step is read.
+- ring: only the last `size` steps.
+- sample: every `every`-th step (the 1st, the `every + 1`-th, ...).
+- counters: no steps at all, just how many times each rule fired.
+- off: nothing.
+
+Whatever the mode, `TermRewriteSystem.steps` counts every fired step, which is the cheap way to
+ask whether anything fired.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, NamedTuple
+
+from .term import Rule, Term
+
+FULL, COMPACT, RING, SAMPLE = "full", "compact", "ring", "sample"
+COUNTERS, OFF = "counters", "off"
+TRACE_MODES = (FULL, COMPACT, RING, SAMPLE, COUNTERS, OFF)
+
+type Path = tuple[int, ...]
+
+
+@dataclass(frozen=True)
+class RewriteStep:
+    """
+    `rule` rewrote `input` into `output`. `path` locates the redex: the indices of the
+    children (Node body or Seq elements) descended through from the term being rewritten,
+    as the engine's pass saw them; it is None when the engine was not tracking positions.
+    """
+
+    rule: Rule
+    input: Term
+    output: Term
+    cost: float = 1.0
+    path: Path | None = None
+
+
+class CompactStep(NamedTuple):
+    """A step stored without its output: an index into `Trace.rules`, the path and the redex."""
+
+    rule: int
+    path: Path | None
+    redex: Term
+    cost: float
+
+
+class Trace:
+    """
+    The recorded steps, bounded according to `mode`. Reads like a list of RewriteSteps.
+
+    >>> from lsd.term import TermRule
+    >>> rule = TermRule("a", "b")
+    >>> trace = Trace(RING, size=2)
+    >>> for _ in range(3):
+    ...     trace.record(rule, "a", "b")
+    >>> len(trace), trace.seen
+    (2, 3)
+    >>> trace = Trace(COUNTERS)
+    >>> trace.record(rule, "a", "b")
+    >>> len(trace), trace.counts[rule]
+    (0, 1)
+    """
+
+    __slots__ = (
+        "mode",
+        "size",
+        "every",
+        "seen",
+        "counts",
+        "rules",
+        "_rule_ids",
+        "_steps",
+        "_compact",
+    )
+
+    def __init__(self, mode: str = FULL, size: int = 1024, every: int = 100):
+        if mode not in TRACE_MODES:
+            raise ValueError(f"Unknown trace mode {mode!r}; expected one of {TRACE_MODES}")
+        self.mode = mode
+        self.size = size
+        self.every = every
+        # Steps offered to `record` since the last `clear`, kept or not.
+        self.seen = 0
+        # Fires per rule; only maintained in counters mode.
+        self.counts: dict[Any, int] = {}
+        # Rules referred to by compact steps, and their ids.
+        self.rules: list[Rule] = []
+        self._rule_ids: dict[int, int] = {}
+        self._steps: list[RewriteStep] | deque[RewriteStep] = (
+            deque(maxlen=size) if mode == RING else []
+        )
+        # The steps of a compact trace, which keeps nothing in `_steps`.
+        self._compact: list[CompactStep] = []
+
+    @property
+    def keeps_terms(self) -> bool:
+        """Does this mode ever store a step's input and output terms?"""
+        return self.mode in (FULL, COMPACT, RING, SAMPLE)
+
+    @property
+    def complete(self) -> bool:
+        """Does this mode keep every step, so that the trace can be replayed?"""
+        return self.mode in (FULL, COMPACT)
+
+    def record(
+        self,
+        rule: Rule,
+        input: Term,
+        output: Term,
+        cost: float = 1.0,
+        path: Path | None = None,
+    ) -> None:
+        """Offer a fired step; it is stored, counted or dropped according to the mode."""
+        mode = self.mode
+        self.seen += 1
+        if mode == COMPACT:
+            rule_id = self._rule_ids.get(id(rule))
+            if rule_id is None:
+                rule_id = self._rule_ids[id(rule)] = len(self.rules)
+                self.rules.append(rule)
+            self._compact.append(CompactStep(rule_id, path, input, cost))
+        elif mode == FULL or mode == RING:
+            self._steps.append(RewriteStep(rule, input, output, cost, path))
+        elif mode == SAMPLE:
+            if (self.seen - 1) % self.every == 0:
+                self._steps.append(RewriteStep(rule, input, output, cost, path))
+        elif mode == COUNTERS:
+            key = _rule_key(rule)
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def count(self, rule: Rule) -> None:
+        """Offer a fired step without its terms, in a mode that would not keep them."""
+        if self.keeps_terms:
+            raise ValueError(f"Trace mode {self.mode!r} needs the step's input and output")
+        self.seen += 1
+        if self.mode == COUNTERS:
+            key = _rule_key(rule)
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def append(self, step: RewriteStep) -> None:
+        self.record(step.rule, step.input, step.output, step.cost, step.path)
+
+    def redexes(self) -> Iterator[tuple[Rule, Path | None, Term]]:
+        """(rule, path, redex) for every step, without rebuilding outputs; see `replay`."""
+        if not self.complete:
+            raise ValueError(f"A {self.mode!r} trace does not hold every step")
+        if self.mode == COMPACT:
+            return ((self.rules[c.rule], c.path, c.redex) for c in self._compact)
+        return ((step.rule, step.path, step.input) for step in self._steps)
+
+    def clear(self) -> None:
+        self._steps.clear()
+        self._compact.clear()
+        self.counts.clear()
+        self.rules.clear()
+        self._rule_ids.clear()
+        self.seen = 0
+
+    def _expand(self, step: CompactStep) -> RewriteStep:
+        rule = self.rules[step.rule]
+        out = rule.apply(step.redex)
+        if out is None:
+            raise ValueError(f"{rule.name()} no longer applies to {step.redex!r}")
+        return RewriteStep(rule, step.redex, out, step.cost, step.path)
+
+    def __len__(self) -> int:
+        return len(self._compact) if self.mode == COMPACT else len(self._steps)
+
+    def __iter__(self) -> Iterator[RewriteStep]:
+        if self.mode == COMPACT:
+            return map(self._expand, self._compact)
+        return iter(self._steps)
+
+    def __getitem__(self, index: int) -> RewriteStep:
+        if self.mode == COMPACT:
+            return self._expand(self._compact[index])
+        return self._steps[index]
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (Trace, list)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"Trace({self.mode}, {list(self)!r})"
+
+
+def as_redexes(steps: Trace | Iterable[RewriteStep]) -> Iterator[tuple[Rule, Path | None, Term]]:
+    """(rule, path, redex) for each of `steps`."""
+    if isinstance(steps, Trace):
+        return steps.redexes()
+    return ((step.rule, step.path, step.input) for step in steps)
+
+
+def _rule_key(rule: Rule) -> Any:
+    try:
+        hash(rule)
+    except TypeError:
+        return rule.name()
+    return rule
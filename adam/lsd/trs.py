@@ -1,32 +1,185 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+import time
+from collections import OrderedDict, deque
+from typing import Iterable, Optional
 
+from lsd.budget import (
+    CYCLE,
+    MAX_PASSES,
+    NORMAL,
+    SIZE_LIMIT,
+    STEP_LIMIT,
+    TIME_LIMIT,
+    Budget,
+    RewriteResult,
+    term_size,
+)
+from lsd.cache import CacheInfo, NormalFormCache
+from lsd.index import NODE, SEQ, ANY, RuleIndex, pattern_key, term_key
 from lsd.method import Method, MethodRule, get_methods
+from lsd.parallel import ParallelRewriter
 from lsd.parser import parse_ensure
+from lsd.profile import Profiler, RuleStats
 from lsd.rules import get_rules
-from lsd.term import Node, Rule, Seq, Term, TermRule
+from lsd.strategy import Context, Strategy, children, rebuild
+from lsd.term import InternTable, Rope, Rule, Seq, Term, TermRule
+from lsd.trace import COMPACT, FULL, RewriteStep, Trace, as_redexes
 
+# Subterms known to be in normal form are remembered by identity; the table is dropped once it
+# grows past this.
+NORMAL_LIMIT = 1 << 16
 
-@dataclass(frozen=True)
-class RewriteStep:
-    rule: Rule
-    input: Term
-    output: Term
-    cost: float = 1.0
+# Rewriting strategies, i.e. where a single pass (`rewrite_once`) looks for redexes:
+#  - hybrid: try the root; if nothing fires, rewrite each child once and retry the root.
+#  - innermost: fire every innermost redex (one whose subterms are all normal).
+#  - outermost: fire only the leftmost-outermost redex.
+#  - parallel-outermost: fire every outermost redex.
+#  - leftmost: fire only the leftmost-innermost redex.
+HYBRID = "hybrid"
+INNERMOST = "innermost"
+OUTERMOST = "outermost"
+PARALLEL_OUTERMOST = "parallel-outermost"
+LEFTMOST = "leftmost"
+STRATEGIES = (HYBRID, INNERMOST, OUTERMOST, PARALLEL_OUTERMOST, LEFTMOST)
+
+# With workers, passes over Seqs at least this long rewrite the elements in parallel.
+PARALLEL_THRESHOLD = 4096
+
+# Under the outermost and leftmost strategies, Seqs at least this long are rewritten as Ropes.
+ROPE_THRESHOLD = 1024
 
 
 class TermRewriteSystem:
     """
     Applies rewrite rules and methods to symbolic terms until a fixed point is reached,
-    recording each fired step in self._trace.
+    recording each fired step in `self.trace`.
+
+    `trace_mode` bounds what the trace keeps (see `lsd.trace`): every step ("full", the
+    default), the last `trace_size` ("ring"), one in `trace_every` ("sample"), per-rule fire
+    counts ("counters") or nothing ("off"). `self.steps` counts fired steps in every mode.
+    The "compact" mode keeps every step as rule, redex path and redex only, and `replay`
+    re-runs such a trace (or a full one) from its initial term.
+
+    A `budget` caps each `rewrite` call's fired steps, wall-clock time and term size. When
+    it runs out, no further rules fire, the current pass completes, and `rewrite` returns
+    the term reached; `self.status` then says why it stopped (see `lsd.budget`), and `run`
+    returns term and status together.
+
+    With `cycle_window`, the engine remembers the hashes of the terms reached after each pass
+    and stops with status "cycle" as soon as one comes back, setting `self.cycle_length` to
+    the number of passes around the loop. A positive `cycle_window` keeps the last that many
+    hashes, None keeps them all, and 0 (the default) turns cycle detection off. Node hashes
+    are cached, so a Node root costs about one dictionary lookup per pass; a Seq root is
+    rehashed every pass, in time linear in its elements (down to the nearest Nodes), which
+    the pass has already spent visiting them. A hash collision could in principle be
+    reported as a cycle.
+
+    With `intern=True`, every term the engine builds (rule outputs and rebuilt Nodes/Seqs)
+    is hash-consed through `self.interner`, so memory scales with the number of distinct
+    subterms instead of total term size.
+
+    With `cache_size > 0`, `rewrite` remembers up to that many normal forms (LRU) and returns
+    the cached one when called again on an equal term. Subterms met mid-pass are not looked
+    up: a subterm's own normal form can skip intermediate states that a rule on an enclosing
+    term would have matched. Steps replayed from the cache are not added to the trace.
+    Adding rules evicts only the entries a new rule could affect; `reset` empties the cache.
+
+    Every subterm object that a pass left untouched is marked as known-normal under the
+    current rules, so later passes (and later calls) skip it in O(1) and keep the object.
+    A pass over a Seq still visits each element, so it stays O(n) in the Seq's length, but
+    a pass that changes nothing copies nothing. The marks are keyed by object identity and
+    keep the marked terms alive (Seqs cannot be weakly referenced), at most `NORMAL_LIMIT`
+    of them; they are dropped whenever the rule set changes and by `reset`.
+
+    `strategy` picks where each pass looks for redexes: one of `STRATEGIES`, or a combinator
+    program from `lsd.strategy` run once per pass (`engine_rules()` stands for the engine's
+    own rules inside it). Whatever the strategy, every fired rule is one step: it is appended
+    to the trace and counted in `self.steps`, while the `max` argument of `rewrite` bounds
+    the number of passes.
+
+    With `workers > 0`, the strategies that rewrite every element of a Seq in one pass (all
+    but outermost and leftmost) farm the elements of Seqs of at least `parallel_threshold`
+    elements out to that many forked worker processes. Results and trace are the same as a
+    serial run. Call `close()` to stop the workers; changing the rules restarts them.
+
+    Under the outermost and leftmost strategies, each pass over a Seq rewrites just one of
+    its elements. When a Seq of at least `rope_threshold` elements is rewritten and no rule
+    can match the Seq as a whole, the engine holds it as a `Rope` between passes, so each
+    pass splices its result in O(log n) and resumes the scan at the previous change rather
+    than copying the whole Seq. The result, trace and pass count are unchanged.
+
+    With `profile=True`, every rule the engine tries is counted and timed (see
+    `lsd.profile`); `stats()` returns the counters, `print_stats()` tabulates them and
+    `reset_stats()` zeroes them. A profiled engine rewrites serially, whatever `workers`.
     """
 
-    _rules: list[Rule]
-    trace: list[RewriteStep]
+    _rules: RuleIndex
+    trace: Trace
+    steps: int
+    strategy: str | Strategy
+    interner: InternTable | None
+    cache: NormalFormCache | None
 
-    def __init__(self, rules: list[Rule] = []):
+    def __init__(
+        self,
+        rules: list[Rule] = [],
+        intern: bool = False,
+        cache_size: int = 0,
+        strategy: str | Strategy = HYBRID,
+        workers: int = 0,
+        parallel_threshold: int = PARALLEL_THRESHOLD,
+        rope_threshold: int = ROPE_THRESHOLD,
+        trace_mode: str = FULL,
+        trace_size: int = 1024,
+        trace_every: int = 100,
+        budget: Budget | None = None,
+        cycle_window: int | None = 0,
+        profile: bool = False,
+    ):
+        self.budget = budget
+        self.cycle_window = cycle_window
+        self.status = NORMAL
+        self.passes = 0
+        self.cycle_length = 0
+        self._halt: str | None = None
+        self._step_limit: int | None = None
+        self._deadline: float | None = None
+        self._size: int | None = None
+        self.trace = Trace(trace_mode, trace_size, trace_every)
+        self.strategy = strategy
+        if isinstance(strategy, Strategy):
+            self._context = EngineContext(self)
+            self._pass = self._run_strategy
+        elif strategy in STRATEGIES:
+            self._pass = {
+                HYBRID: self._hybrid,
+                INNERMOST: self._innermost,
+                OUTERMOST: self._outermost,
+                PARALLEL_OUTERMOST: self._parallel_outermost,
+                LEFTMOST: self._leftmost,
+            }[strategy]
+        else:
+            raise ValueError(f"Unknown strategy {strategy!r}; expected one of {STRATEGIES}")
+        self.steps = 0
+        self.parallel_threshold = parallel_threshold
+        self.rope_threshold = rope_threshold
+        self.parallel = (
+            ParallelRewriter(self, workers)
+            if workers > 0 and ParallelRewriter.available()
+            else None
+        )
+        self.interner = InternTable() if intern else None
+        self.profiler = Profiler() if profile else None
+        self.cache = NormalFormCache(cache_size) if cache_size > 0 else None
+        self._visited: set | None = None
+        self._normal: dict[int, tuple[Term, frozenset | None]] = {}
+        # Child indices from the pass root down to the subterm being rewritten, kept only
+        # when steps record their paths; combinator strategies do not report positions.
+        self._paths: list[int] | None = (
+            [] if trace_mode == COMPACT and not isinstance(strategy, Strategy) else None
+        )
+        self._script: deque | None = None
         self.reset()
         for rule in rules:
             self.add_rule(rule)
@@ -37,10 +190,20 @@ class TermRewriteSystem:
          - all parser‑defined TermRules
          - a MethodRule for each built‑in Method
         """
-        self.trace = []
-        self._rules = get_rules()
+        self.trace = Trace(self.trace.mode, self.trace.size, self.trace.every)
+        self.steps = 0
+        self._rules = RuleIndex([rule.compile() for rule in get_rules()])
         for m in get_methods():
-            self._rules.append(MethodRule(m))
+            self._rules.append(MethodRule(m).compile())
+        self._normal.clear()
+        if self.interner is not None:
+            self.interner.clear()
+        if self.parallel is not None:
+            self.parallel.close()
+        if self.cache is not None:
+            self.cache.clear()
+        if self.profiler is not None:
+            self.profiler.reset()
 
     def add_rule(
         self,
@@ -53,77 +216,491 @@ class TermRewriteSystem:
         Otherwise parse `first` / `second` as LHS→RHS.
         """
         if isinstance(first, Rule):
-            self._rules.insert(0, first)
+            self._insert(first)
         else:
             lhs = parse_ensure(first)
             if second is None:
                 raise ValueError("Right-hand side required when adding a new rule.")
             rhs = parse_ensure(second)
-            self._rules.insert(0, TermRule(lhs, rhs))
+            self._insert(TermRule(lhs, rhs))
 
     def add_method(self, method: Method) -> None:
         """
         Wrap a Method into a MethodRule and insert at highest priority.
         """
-        self._rules.insert(0, MethodRule(method))
+        self._insert(MethodRule(method))
+
+    def _insert(self, rule: Rule) -> None:
+        self._rules.prepend(rule.compile())
+        self._normal.clear()
+        if self.parallel is not None:
+            self.parallel.close()
+        if self.cache is not None:
+            self.cache.invalidate(pattern_key(rule.pattern)[0])
+
+    def cache_info(self) -> CacheInfo | None:
+        """Hit/miss counters and size of the normal-form cache, or None if it is disabled."""
+        return None if self.cache is None else self.cache.info()
+
+    def stats(self) -> list[RuleStats]:
+        """Per-rule counters and timings since the last reset; empty unless profiling."""
+        return [] if self.profiler is None else self.profiler.stats()
+
+    def reset_stats(self) -> None:
+        if self.profiler is not None:
+            self.profiler.reset()
+
+    def print_stats(self) -> None:
+        """Print the per-rule counters as a table, most expensive rule first."""
+        if self.profiler is not None:
+            self.profiler.print()
 
     def rewrite(self, term: Term, max: int | None = None) -> Term:
         """
-        Fully normalize `term` by repeatedly doing single‐step passes until no change.
+        Normalize `term` by repeating single-step passes until one changes nothing.
+
+        Args:
+            term: The term to rewrite.
+            max: If given, stop after at most this many passes even if rules still apply.
+
+        Returns:
+            The last term reached.
         """
-        out = self.rewrite_once(term)
-        max = None if max is None else max - 1
+        if self.cache is None or max is not None:
+            return self._rewrite(term, max)
 
-        if max is None:
-            return out if out == term else self.rewrite(out, max)
-        else:
-            while max > 0:
-                term = self.rewrite_once(term)
-                max -= 1
+        cached = self._cached(term)
+        if cached is not None:
+            self.status, self.passes, self.cycle_length = NORMAL, 0, 0
+            return cached
+
+        outer, self._visited = self._visited, set()
+        try:
+            out = self._rewrite(term, max)
+        finally:
+            visited, self._visited = self._visited, outer
+        if self.status == NORMAL:
+            self.cache.store(term, out, visited)
+        if outer is not None:
+            outer |= visited
+        return out
+
+    def _cached(self, term: Term) -> Term | None:
+        """The cached normal form of `term`, crediting its keys to the running derivation."""
+        entry = self.cache.lookup(term) if self.cache is not None else None
+        if entry is None:
+            return None
+        normal, keys = entry
+        if self._visited is not None:
+            self._visited |= keys
+        return normal
+
+    def run(self, term: Term, max: int | None = None) -> RewriteResult:
+        """Like `rewrite`, but also report why rewriting stopped and how much it did."""
+        steps = self.steps
+        out = self.rewrite(term, max)
+        return RewriteResult(out, self.status, self.steps - steps, self.passes, self.cycle_length)
+
+    def _rewrite(self, term: Term, max: int | None = None) -> Term:
+        self._start_budget(term)
+        # `rewrite_once` hands back the very same object when nothing fired, so the fixed
+        # point is detected by identity rather than by comparing whole terms.
+        status = NORMAL
+        passes = cycle = 0
+        window = self.cycle_window
+        seen: OrderedDict[int, int] | None = None if window == 0 else OrderedDict()
+        if seen is not None:
+            self._remember(seen, term, passes)
+        try:
+            stopped = None
+            if seen is None and self._use_rope(term):
+                term, passes, stopped = self._rewrite_rope(term, max)  # type: ignore[arg-type]
+            while stopped is None:
+                if max is not None and passes >= max:
+                    status = MAX_PASSES
+                    break
+                out = self.rewrite_once(term)
+                passes += 1
+                if self._halt is not None:
+                    status, term = self._halt, out
+                    break
+                if out is term:
+                    break
+                term = out
+                if self._deadline is not None and time.monotonic() >= self._deadline:
+                    status = TIME_LIMIT
+                    break
+                if seen is not None:
+                    cycle = self._remember(seen, term, passes)
+                    if cycle:
+                        status = CYCLE
+                        break
+            else:
+                status = stopped
+        finally:
+            self._halt = self._step_limit = self._deadline = self._size = None
+        self.status, self.passes, self.cycle_length = status, passes, cycle
         return term
 
+    def _use_rope(self, term: Term) -> bool:
+        return (
+            self.strategy in (OUTERMOST, LEFTMOST)
+            and isinstance(term, Seq)
+            and len(term) >= self.rope_threshold
+            and not self._rules.lookup((SEQ,), len(term))
+            and not self._known_normal(term)
+            # `rebuild` flattens nested Seqs, which a Rope pass would leave alone.
+            and not any(isinstance(t, Seq) for t in term)
+        )
+
+    def _rewrite_rope(self, term: Seq, max: int | None) -> tuple[Term, int, str | None]:
+        """
+        The passes of `_rewrite` over a long Seq no rule matches as a whole, with the Seq held
+        as a Rope. A pass rewrites the first element that changes and splices in the result.
+        The elements before it were left alone, so they are normal, and the next pass resumes
+        from it. Returns the term, the passes made, and the status; the status is None if
+        the Seq stopped qualifying for this, and `_rewrite` should carry on in the usual way.
+        """
+        rope = Rope.of(term)
+        changed = False
+        passes = start = 0
+        # Stands in for the root rule lookups of the usual passes, for the normal-form cache.
+        self._visit(term)
+
+        def result() -> Term:
+            return self._build(rope.to_seq()) if changed else term
+
+        while True:
+            if len(rope) < self.rope_threshold or self._rules.lookup((SEQ,), len(rope)):
+                return result(), passes, None
+            if max is not None and passes >= max:
+                return result(), passes, MAX_PASSES
+            passes += 1
+            for i, arg in enumerate(rope.iter_from(start), start):
+                out = self._rewrite_child(arg, i)
+                if out is not arg:
+                    break
+            else:
+                out = result()
+                self._mark_normal(out)
+                return out, passes, NORMAL
+
+            nested = isinstance(out, Seq)
+            rope = rope.splice(i, i + 1, out if nested else (out,))  # type: ignore[arg-type]
+            changed = True
+            start = i
+            if self._halt is not None:
+                return result(), passes, self._halt
+            if self._deadline is not None and time.monotonic() >= self._deadline:
+                return result(), passes, TIME_LIMIT
+            if nested and any(isinstance(t, Seq) for t in out):  # type: ignore[union-attr]
+                return result(), passes, None
+
+    def _remember(self, seen: OrderedDict[int, int], term: Term, passes: int) -> int:
+        """Record the state after `passes` passes; return the cycle length if it is a repeat."""
+        try:
+            h = hash(term)
+        except TypeError:
+            return 0
+        first = seen.get(h)
+        if first is not None:
+            return passes - first
+        seen[h] = passes
+        if self.cycle_window is not None and len(seen) > self.cycle_window:
+            seen.popitem(last=False)
+        return 0
+
+    def _start_budget(self, term: Term) -> None:
+        budget = self.budget
+        if budget is None:
+            return
+        if budget.max_steps is not None:
+            self._step_limit = self.steps + budget.max_steps
+            if budget.max_steps <= 0:
+                self._halt = STEP_LIMIT
+        if budget.time_limit is not None:
+            self._deadline = time.monotonic() + budget.time_limit
+        if budget.max_size is not None:
+            self._size = term_size(term)
+            if self._size > budget.max_size:
+                self._halt = SIZE_LIMIT
+
+    def _charge(self, term: Term, out: Term) -> None:
+        """Count a fired step against the budget, halting further steps once it runs out."""
+        if self._step_limit is not None and self.steps >= self._step_limit:
+            self._halt = STEP_LIMIT
+        if self._deadline is not None and time.monotonic() >= self._deadline:
+            self._halt = TIME_LIMIT
+        if self._size is not None:
+            # Splicing a Seq into its parent removes one Seq, so this may overestimate.
+            self._size += term_size(out) - term_size(term)
+            if self._size > self.budget.max_size:  # type: ignore[union-attr, operator]
+                self._halt = SIZE_LIMIT
+
     def rewrite_once(self, term: Term) -> Term:
-        # 1) Try every rule/method at the root
-        for rule in self._rules:
-            out = rule.apply(term)
-            if out is not None:
-                # record and return immediately
-                self.trace.append(RewriteStep(rule, term, out, cost=1.0))
-                return out
-
-        # 2) If none fired, recurse into Node
-        if isinstance(term, Node):
-            new_args = [self.rewrite_once(arg) for arg in term.body]
-            rebuilt = Node(term.head, *new_args)
-            # try firing again on rebuilt node
-            for rule in self._rules:
-                out = rule.apply(rebuilt)
-                if out is not None:
-                    self.trace.append(RewriteStep(rule, rebuilt, out, cost=1.0))
-                    return out
+        """
+        Do a single rewrite pass over `term` using the engine's strategy.
+
+        Returns `term` itself (not merely an equal term) when no rule fired anywhere.
+        """
+        if self._known_normal(term):
+            return term
+        out = self._pass(term)
+        if out is term:
+            self._mark_normal(term)
+        return out
+
+    def _hybrid(self, term: Term) -> Term:
+        # 1) Try every rule/method that could match at the root
+        out = self._apply_rules(term)
+        if out is not None:
+            return out
+
+        # 2) If none fired, rewrite every child once
+        rebuilt = self._rebuild(term, self._rewrite_children(term))
+        if rebuilt is term:
+            return term
+
+        # 3) Try firing again on the rebuilt term
+        out = self._apply_rules(rebuilt)
+        if out is None and all(self._is_marked(arg) for arg in children(rebuilt)):
+            self._mark_normal(rebuilt)
+        return rebuilt if out is None else out
+
+    def _innermost(self, term: Term) -> Term:
+        rebuilt = self._rebuild(term, self._rewrite_children(term))
+        if rebuilt is not term:
             return rebuilt
+        out = self._apply_rules(term)
+        return term if out is None else out
+
+    def _parallel_outermost(self, term: Term) -> Term:
+        out = self._apply_rules(term)
+        if out is not None:
+            return out
+        return self._rebuild(term, self._rewrite_children(term))
+
+    def _outermost(self, term: Term) -> Term:
+        out = self._apply_rules(term)
+        if out is not None:
+            return out
+        return self._rewrite_first(term)
 
-        # 3) Recurse into Seq
-        if isinstance(term, Seq):
-            items: list[Term] = []
-            for elt in term:
-                r = self.rewrite_once(elt)
-                if isinstance(r, Seq):
-                    items.extend(r)
-                else:
-                    items.append(r)
-            rebuilt = Seq(*items)
-            # try firing on rebuilt sequence
-            for rule in self._rules:
-                out = rule.apply(rebuilt)
-                if out is not None:
-                    self.trace.append(RewriteStep(rule, rebuilt, out, cost=1.0))
-                    return out
+    def _leftmost(self, term: Term) -> Term:
+        rebuilt = self._rewrite_first(term)
+        if rebuilt is not term:
             return rebuilt
+        out = self._apply_rules(term)
+        return term if out is None else out
 
-        # 4) Atomic term with no rule applies
+    def _rewrite_children(self, term: Term) -> list[Term]:
+        """One pass over each child of `term`, in parallel for large Seqs when enabled."""
+        if (
+            self.parallel is not None
+            and self.profiler is None
+            and self.budget is None
+            and self._visited is None
+            and isinstance(term, Seq)
+            and len(term) >= self.parallel_threshold
+        ):
+            return self.parallel.rewrite_all(term)
+        return [self._rewrite_child(arg, i) for i, arg in enumerate(children(term))]
+
+    def _run_strategy(self, term: Term) -> Term:
+        out = self.strategy(term, self._context)  # type: ignore[operator]
+        return term if out is None else out
+
+    def _rewrite_first(self, term: Term) -> Term:
+        """Rewrite the leftmost child that changes, leaving the others alone."""
+        args = children(term)
+        for i, arg in enumerate(args):
+            out = self._rewrite_child(arg, i)
+            if out is not arg:
+                return self._rebuild(term, [*args[:i], out, *args[i + 1 :]])
         return term
 
+    def _rebuild(self, term: Term, new_args: list[Term]) -> Term:
+        return rebuild(term, new_args, self._build)
+
+    def _rewrite_child(self, term: Term, index: int) -> Term:
+        """One pass over the `index`-th child of the subterm being rewritten."""
+        paths = self._paths
+        if paths is None:
+            return self._rewrite_subterm(term)
+        paths.append(index)
+        try:
+            return self._rewrite_subterm(term)
+        finally:
+            paths.pop()
+
+    def _rewrite_subterm(self, term: Term) -> Term:
+        """One pass over a subterm."""
+        if self._visited is None:
+            return self.rewrite_once(term)
+        # Collect the child's keys separately so a normal-form mark on it carries only its own.
+        outer, self._visited = self._visited, set()
+        try:
+            out = self.rewrite_once(term)
+        finally:
+            keys, self._visited = self._visited, outer
+        outer |= keys
+        return out
+
+    def _known_normal(self, term: Term) -> bool:
+        """Is `term` marked normal? Credits the keys its derivation tried to a running cache."""
+        entry = self._normal.get(id(term))
+        if entry is None or entry[0] is not term:
+            return False
+        if self._visited is not None:
+            # A mark made outside a cached normalization has no keys to hand on.
+            if entry[1] is None:
+                return False
+            self._visited |= entry[1]
+        return True
+
+    def _is_marked(self, term: Term) -> bool:
+        entry = self._normal.get(id(term))
+        return entry is not None and entry[0] is term
+
+    def _mark_normal(self, term: Term) -> None:
+        if self._halt is not None:
+            # Rules stopped firing because the budget ran out, not because none apply.
+            return
+        # The entry keeps `term` alive, so its id cannot be reused while it is marked.
+        if len(self._normal) >= NORMAL_LIMIT:
+            self._normal.clear()
+        keys = None if self._visited is None else frozenset(self._visited)
+        self._normal[id(term)] = (term, keys)
+
+    def _apply_rules(self, term: Term) -> Term | None:
+        """Fire the highest-priority rule that matches `term`, recording the step."""
+        if self._halt is not None:
+            return None
+        if self._script is not None:
+            return self._scripted(term)
+        self._visit(term)
+        if self.profiler is not None:
+            return self._profile_rules(term)
+        for rule in self._rules.candidates(term):
+            out = rule.apply(term)
+            if out is not None:
+                return self._record(rule, term, out)
+        return None
+
+    def _profile_rules(self, term: Term) -> Term | None:
+        assert self.profiler is not None
+        size = term_size(term)
+        for rule in self._rules.candidates(term):
+            out = self.profiler.apply(rule, term, size)
+            if out is not None:
+                return self._record(rule, term, out)
+        return None
+
+    def _apply_rule(self, rule: Rule, term: Term) -> Term | None:
+        """Fire `rule` at `term` if it matches, recording the step."""
+        if self._halt is not None:
+            return None
+        if self._script is not None:
+            return self._scripted(term, rule)
+        self._visit(term)
+        if self.profiler is None:
+            out = rule.apply(term)
+        else:
+            out = self.profiler.apply(rule, term, term_size(term))
+        return None if out is None else self._record(rule, term, out)
+
+    def _visit(self, term: Term) -> None:
+        if self._visited is not None:
+            try:
+                self._visited.add(term_key(term)[0])
+            except TypeError:
+                self._visited.add((NODE, ANY))
+
+    def _record(self, rule: Rule, term: Term, out: Term) -> Term:
+        out = self._build(out)
+        self._replay(rule, term, out, path=None if self._paths is None else tuple(self._paths))
+        if self.budget is not None:
+            self._charge(term, out)
+        # A step that reproduces its input is recorded but changes nothing.
+        return term if out == term else out
+
+    def _replay(
+        self,
+        rule: Rule,
+        term: Term | None,
+        out: Term | None,
+        cost: float = 1.0,
+        path: tuple[int, ...] | None = None,
+    ) -> None:
+        """
+        Account for a step fired here or, in parallel mode, in a worker. A worker sends no
+        terms (None) when the trace mode keeps none.
+        """
+        self.steps += 1
+        if term is None or out is None:
+            self.trace.count(rule)
+        else:
+            self.trace.record(rule, term, out, cost, path)
+
+    def replay(self, term: Term, steps: Trace | Iterable[RewriteStep]) -> Term:
+        """
+        Re-run a recorded derivation from its initial `term`.
+
+        Instead of matching rules, every pass fires only the next recorded step, at the first
+        position visited that has the recorded path (when there is one) and redex. The
+        replayed steps are recorded in this engine's trace.
+
+        Args:
+            term: The term the recorded derivation started from.
+            steps: A full or compact `Trace`, or RewriteSteps in the order they fired.
+
+        Returns:
+            The final term of the derivation.
+
+        Raises:
+            ValueError: If a recorded step cannot be reproduced.
+        """
+        script = deque(as_redexes(steps))
+        saved = self._paths, self._normal, self.parallel, self._visited
+        self._script = script
+        self._paths = None if isinstance(self.strategy, Strategy) else []
+        self._normal, self.parallel, self._visited = {}, None, None
+        try:
+            out = self._rewrite(term)
+        finally:
+            self._paths, self._normal, self.parallel, self._visited = saved
+            self._script = None
+        if script:
+            rule, path, redex = script[0]
+            raise ValueError(f"Could not replay {rule.name()} on {redex!r} at {path}")
+        return out
+
+    def _scripted(self, term: Term, rule: Rule | None = None) -> Term | None:
+        """Fire the next step of the script being replayed, if it was taken at `term`."""
+        if not self._script:
+            return None
+        next_rule, path, redex = self._script[0]
+        if rule is not None and rule is not next_rule:
+            return None
+        if path is not None and (self._paths is None or path != tuple(self._paths)):
+            return None
+        if redex is not term and redex != term:
+            return None
+        out = next_rule.apply(term)
+        if out is None:
+            raise ValueError(f"{next_rule.name()} no longer applies to {term!r}")
+        self._script.popleft()
+        return self._record(next_rule, term, out)
+
+    def _build(self, term: Term) -> Term:
+        """Intern a term the engine produced, when interning is enabled."""
+        return term if self.interner is None else self.interner.intern(term)
+
+    def close(self) -> None:
+        """Stop the parallel workers, if any."""
+        if self.parallel is not None:
+            self.parallel.close()
+
     def get_trace(self) -> list[RewriteStep]:
         """Return the list of RewriteSteps recorded since last reset."""
         return list(self.trace)
@@ -131,3 +708,19 @@ class TermRewriteSystem:
     def clear_trace(self) -> None:
         """Erase the recorded trace steps."""
         self.trace.clear()
+
+
+class EngineContext(Context):
+    """Lets combinator strategies fire rules through a `TermRewriteSystem`, so steps are traced."""
+
+    def __init__(self, engine: TermRewriteSystem):
+        self.engine = engine
+
+    def apply_rule(self, rule: Rule, term: Term) -> Term | None:
+        return self.engine._apply_rule(rule, term)
+
+    def apply_rules(self, term: Term) -> Term | None:
+        return self.engine._apply_rules(term)
+
+    def build(self, term: Term) -> Term:
+        return self.engine._build(term)
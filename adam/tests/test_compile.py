@@ -0,0 +1,71 @@
+import pytest
+from lsd.compile import compile_pattern, is_ground
+from lsd.env import Env
+from lsd.match import match_pattern
+from lsd.parser import parse
+from lsd.term import Node, Seq, Span, TermRule, Var
+
+
+@pytest.mark.parametrize(
+    "pattern, target",
+    [
+        ("x", "x"),
+        ("x", "y"),
+        ("!X", "a"),
+        ("!X:int", "a"),
+        ("?X:int", "a"),
+        ("*X:str", "a"),
+        ("!A !A", "x x"),
+        ("!A !A", "x y"),
+        ("!A !B", "x"),
+        ("!A ?B", "x"),
+        ("?A ?B", ""),
+        ("*A x *B", "a x c d"),
+        ("*A x *B", "a y c d"),
+        ("!A !B *S", "x y 1 2 3"),
+        ("_ x y z", "1 x y z"),
+        ("_", "anything"),
+        ("f[!X b]", "f[a b]"),
+        ("f[!X b]", "g[a b]"),
+        ("f[!X g[!X]]", "f[a g[a]]"),
+        ("f[!X g[!X]]", "f[a g[b]]"),
+        ("Last[*A !X]", "Last[a b c]"),
+    ],
+)
+def test_compiled_agrees_with_interpreter(pattern, target):
+    p, t = parse(pattern), parse(target)
+    assert compile_pattern(p)(t, Env()) == match_pattern(p, t)
+
+
+def test_compiled_threads_env():
+    m = compile_pattern(Seq(Var("X"), Var("Y")))
+    assert m(Seq(1, 2), Env(X=(1,))) == Env(X=(1,), Y=(2,))
+    assert m(Seq(1, 2), Env(X=(3,))) is None
+
+
+def test_is_ground():
+    assert is_ground(Node("f", 1, Seq("a")))
+    assert not is_ground(Node("f", 1, Seq(Var("X"))))
+    assert not is_ground(parse("_ a"))
+
+
+def test_rule_matcher_is_cached():
+    rule = TermRule(Node("f", Var("X", Span(0, None))), "y")
+    assert rule.compile().matcher is rule.matcher
+    assert rule.apply(Node("f", 1, 2)) == "y"
+    assert rule.apply(Node("g", 1, 2)) is None
+
+
+def test_compiled_backtracks_into_elements():
+    # The first split of the inner Seq binds A=(a), which the second element rejects.
+    A = Var("A", Span(0, None))
+    p = Seq(parse("*A x *B"), Seq(A))
+    t = Seq(Seq(*"axbxc"), Seq(*"axb"))
+    assert compile_pattern(p)(t, Env()) == match_pattern(p, t) == Env(A=tuple("axb"), B=("c",))
+
+
+def test_compiled_matches_views():
+    view = Seq(*"zzaxcdzz").view(2, 6)
+    for pattern in ["*A x *B", "!A !B !C !D", "!A !B", "_"]:
+        p = parse(pattern)
+        assert compile_pattern(p)(view, Env()) == match_pattern(p, view)
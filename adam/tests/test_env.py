@@ -13,3 +13,26 @@ class TestEnv(unittest.TestCase):
         b = Env(B=2)
         c = Env.combine(a, b)
         self.assertEqual(c, Env(A=1, B=2))
+
+    def test_bind_is_persistent(self):
+        a = Env(A=1)
+        b = a.bind("B", 2)
+        self.assertEqual(a, Env(A=1))
+        self.assertEqual(b, Env(A=1, B=2))
+        self.assertIs(b.parent, a)
+
+    def test_extend_shadows(self):
+        a = Env(A=1)
+        b = a.extend("A", 2)
+        self.assertEqual(a["A"], 1)
+        self.assertEqual(b["A"], 2)
+        self.assertEqual(len(b), 1)
+
+    def test_mapping_api(self):
+        env = Env({"A": (1,)}, B=(2,))
+        self.assertIn("A", env)
+        self.assertNotIn("C", env)
+        self.assertEqual(env.get("C", ()), ())
+        self.assertEqual(dict(env), {"A": (1,), "B": (2,)})
+        with self.assertRaises(KeyError):
+            env["C"]
@@ -0,0 +1,73 @@
+import pytest
+from lsd.flat import FlatPattern, FlatTerm, SymbolTable
+from lsd.match import match_pattern
+from lsd.parser import parse
+from lsd.term import Node, Seq, Var
+
+TERMS = [
+    "a",
+    3,
+    Seq(),
+    Node("F"),
+    Seq("a", Seq(), Node("F", 1, 2.5)),
+    Node(Node("H", "x"), Seq("a", "b"), "c"),
+    Node("F", Var("X")),
+]
+
+
+@pytest.mark.parametrize("term", TERMS)
+def test_roundtrip(term):
+    flat = FlatTerm.encode(term)
+    assert flat.decode() == term
+    assert len(flat) == flat.sizes[0]
+
+
+def test_equal_terms_encode_equal():
+    table = SymbolTable()
+    a = FlatTerm.encode(parse("F[a G[b]]"), table)
+    b = FlatTerm.encode(parse("F[a G[b]]"), table)
+    assert a == b and hash(a) == hash(b)
+    assert a != FlatTerm.encode(parse("F[a G[c]]"), table)
+    # Same shape, one more child: the tags differ.
+    assert a != FlatTerm.encode(parse("F[a G[b b]]"), table)
+
+
+@pytest.mark.parametrize(
+    "pattern, target",
+    [
+        ("F[!X b]", "F[a b]"),
+        ("F[!X b]", "F[a c]"),
+        ("F[!X !X]", "F[G[a] G[a]]"),
+        ("F[!X !X]", "F[G[a] G[b]]"),
+        ("F[G[!X] !Y]", "F[G[a b] c]"),
+        ("F[G[!X] !Y]", "F[G[a] H[c]]"),
+        ("F[a b]", "F[a b]"),
+        ("F[a b]", "F[a]"),
+        ("!X", "F[a]"),
+    ],
+)
+def test_match_agrees_with_match_pattern(pattern, target):
+    table = SymbolTable()
+    pattern, target = parse(pattern), parse(target)
+    flat = FlatTerm.encode(target, table)
+    bound = FlatPattern(pattern, table).match(flat)
+    env = match_pattern(pattern, target)
+    if env is None:
+        assert bound is None
+    else:
+        assert {name: (flat.decode(at),) for name, at in bound.items()} == dict(env)
+
+
+def test_search_finds_every_match():
+    table = SymbolTable()
+    flat = FlatTerm.encode(parse("G[F[a] H[F[b] F[a]]]"), table)
+    pattern = FlatPattern(parse("F[!X]"), table)
+    assert [flat.decode(b["X"]) for _, b in pattern.search(flat)] == ["a", "b", "a"]
+    assert [at for at, _ in FlatPattern(parse("F[a]"), table).search(flat)] == [2, 10]
+
+
+def test_only_plain_vars():
+    with pytest.raises(ValueError):
+        FlatPattern(parse("F[*X]"), SymbolTable())
+    with pytest.raises(ValueError):
+        FlatPattern(parse("F[_]"), SymbolTable())
@@ -0,0 +1,40 @@
+from lsd.index import RuleIndex
+from lsd.parser import parse
+from lsd.term import Node, Seq, TermRule, Var
+
+
+def names(rules):
+    return [rule.rhs for rule in rules]
+
+
+def test_candidates_keep_priority_across_buckets():
+    index = RuleIndex()
+    index.append(TermRule(Node("f", Var("X")), "f1"))
+    index.append(TermRule(Var("X"), "any"))
+    index.prepend(TermRule(Node("f", Var("X")), "f0"))
+    index.append(TermRule(Node(Var("H"), Var("X")), "node"))
+    assert names(index.candidates(Node("f", 1))) == ["f0", "f1", "any", "node"]
+    assert names(index.candidates(Node("g", 1))) == ["any", "node"]
+    assert names(index) == ["f0", "f1", "any", "node"]
+
+
+def test_candidates_filter_by_arity():
+    index = RuleIndex()
+    index.append(TermRule(parse("Last[*A !X]"), "last"))
+    index.append(TermRule(parse("Pair[!A !B]"), "pair"))
+    index.append(TermRule(parse("Pair[!A ?B]"), "maybe"))
+    assert names(index.candidates(parse("Last[a]"))) == ["last"]
+    assert names(index.candidates(Node("Last"))) == []
+    assert names(index.candidates(parse("Pair[a b]"))) == ["pair", "maybe"]
+    assert names(index.candidates(parse("Pair[a]"))) == ["maybe"]
+    assert names(index.candidates(parse("Pair[a b c]"))) == []
+
+
+def test_candidates_for_seqs_and_atoms():
+    index = RuleIndex()
+    index.append(TermRule("A", "atom"))
+    index.append(TermRule(parse("*A m *B"), "seq"))
+    assert names(index.candidates("A")) == ["atom"]
+    assert names(index.candidates("B")) == []
+    assert names(index.candidates(Seq("m"))) == ["seq"]
+    assert names(index.candidates(Seq())) == []
@@ -1,8 +1,9 @@
 import pytest
 from lsd.env import Env
-from lsd.match import match_pattern
+from lsd.match import SeqPlan, SeqSearch, match_all, match_pattern
 from lsd.parser import parse, parse_ensure
-from lsd.term import Node, Seq, Span, Term, Var
+from lsd.compile import compile_pattern
+from lsd.term import LetterSeq, Node, Seq, Span, Term, Var
 
 
 def mp(pat: str | Term, tgt: str | Term) -> Env | None:
@@ -139,3 +140,107 @@ def test_wildcard():
     assert mp("_ a b c", "z a b c") == Env()
     assert mp("_", "anything") == Env()
     assert mp("_ x y", "a x y") == Env()
+
+
+def test_env_is_not_mutated():
+    env = Env(A=("x",))
+    assert match_pattern(parse("!A !B"), parse("x y"), env) == Env(A=("x",), B=("y",))
+    assert match_pattern(parse("!A !B"), parse("z y"), env) is None
+    assert env == Env(A=("x",))
+
+
+def test_node_wildcard_body():
+    assert mp(Node("f", parse("_")), Node("f", 1)) == Env()
+
+
+def test_match_all_enumerates_segmentations():
+    envs = list(match_all(parse("*A x *B"), parse("a x b x c")))
+    assert envs == [
+        Env(A=("a",), B=("b", "x", "c")),
+        Env(A=("a", "x", "b"), B=("c",)),
+    ]
+    assert envs[0] == mp("*A x *B", "a x b x c")
+
+
+def test_match_all_is_lazy_and_limited():
+    matches = match_all(parse("*A x *B"), parse("x x x x"))
+    assert next(matches) == Env(A=(), B=("x", "x", "x"))
+    assert len(list(match_all(parse("*A x *B"), parse("x x x x"), limit=2))) == 2
+    assert list(match_all(parse("*A x *B"), parse("a b c"))) == []
+
+
+def test_match_all_backtracks_into_nodes():
+    pat = Seq(Node("f", Var("A", Span(0, None)), "x", Var("B", Span(0, None))), Var("B"))
+    tgt = Seq(Node("f", "x", "x", "c"), "c")
+    assert list(match_all(pat, tgt)) == [Env(A=("x",), B=("c",))]
+
+
+def test_spread_respects_span():
+    assert mp("+A x", Seq("x")) is None
+    assert mp("+A x", "a x") == Env(A=("a",))
+    assert mp("*A x", Seq("x")) == Env(A=())
+
+
+def test_spread_respects_guards():
+    assert mp("*A:int *B", Seq(1, 2, "a", 3)) == Env(A=(), B=(1, 2, "a", 3))
+    assert mp("+A:int !B", Seq(1, 2, "a")) == Env(A=(1, 2), B=("a",))
+    assert mp("+A:int !B", Seq(1, "a", "b")) is None
+    assert mp("+A:int:str", Seq(1, 2)) == Env(A=(1, 2))
+    assert mp("+A:int:str", Seq(1, "a")) is None
+
+
+def test_spread_back_reference():
+    assert mp("*A x *A", "a b x a b") == Env(A=("a", "b"))
+    assert mp("*A x *A", "a b x a c") is None
+
+
+def test_fixed_tail_pins_cut():
+    letters = Seq(*("abcdefghij" * 500), "x", "y")
+    assert mp("*A !X !Y", letters) == Env(A=tuple(letters[:-2]), X=("x",), Y=("y",))
+    assert mp("*A a !X", letters) is None
+
+
+def test_failed_states_are_explored_once():
+    # Pathological input: every way of placing the four `a`s fails only at the final `b`.
+    # Plain backtracking explores C(n, 4) splits; with failure memoization each
+    # (pattern index, target index) state is expanded at most once.
+    pattern = parse("*A a *B a *C a *D a *E b")
+    target = Seq(*("a" * 200))
+    search = SeqSearch(SeqPlan.of(pattern), target)
+    assert next(search.at(0, 0, Env()), None) is None
+    assert search.explored <= (len(pattern) + 1) * (len(target) + 1)
+
+
+def test_memoization_keeps_back_references_exact():
+    assert mp("*A x *A y", "a x x a x y") == Env(A=("a", "x"))
+    assert list(match_all(parse("*A *B *A"), parse("a a"))) == [
+        Env(A=(), B=("a", "a")),
+        Env(A=("a",), B=()),
+    ]
+
+
+def test_match_against_view():
+    letters = Seq(*"zzaxcdzz")
+    view = letters.view(2, 6)
+    assert mp("*A x *B", view) == Env(A=("a",), B=("c", "d"))
+    assert mp("!A x *B", view) == Env(A=("a",), B=("c", "d"))
+    assert mp("*A:str", view) == Env(A=tuple("axcd"))
+    assert mp("*A z", view) is None
+    assert mp("a x c d", view) == Env()
+    assert list(match_all(parse("*A *B"), view[3:])) == [Env(A=(), B=("d",)), Env(A=("d",), B=())]
+
+
+def test_letter_seq_matches_like_a_seq():
+    letters = LetterSeq("axcd")
+    assert mp("*A x *B", letters) == Env(A=("a",), B=("c", "d"))
+    assert mp(Seq("a", "x", "c", "d"), letters) == Env()
+    assert compile_pattern(parse("*A x *B"))(letters, Env()) == Env(A=("a",), B=("c", "d"))
+    assert compile_pattern(parse("!A x !B !C"))(letters, Env()) == Env(A=("a",), B=("c",), C=("d",))
+    assert compile_pattern(parse("!A x"))(letters, Env()) is None
+
+
+def test_spread_var_binds_letter_seq_like_a_seq():
+    xs = Var("X", Span(0, None))
+    for target in (LetterSeq("ab"), Seq("a", "b")):
+        assert match_pattern(xs, target) == Env(X=("a", "b"))
+        assert compile_pattern(xs)(target, Env()) == Env(X=("a", "b"))
@@ -1,4 +1,17 @@
-from lsd.method import Method, Pred, Reverse, Rotate2ThenReverse, Succ, TripleSucc
+from lsd.method import (
+    Max,
+    Method,
+    Min,
+    Pred,
+    Reverse,
+    Rotate2ThenReverse,
+    RotateRight1,
+    Succ,
+    SwapFirstLast,
+    TripleSucc,
+)
+from lsd.term import LetterSeq, Node, Seq, Var
+from lsd.trs import TermRewriteSystem
 
 
 def test_succ_pred():
@@ -39,3 +52,31 @@ def test_method_call():
     assert Succ("a") == "b"
     assert Pred("b") == "a"
     assert Reverse("abc") == "cba"
+
+
+def test_letter_seq_kernels():
+    s = LetterSeq("abcz")
+    assert Succ(s) == LetterSeq("bcd{")
+    assert Pred(s) == Seq(*"`aby")
+    assert Reverse(s) == LetterSeq("zcba")
+    assert RotateRight1(s) == LetterSeq("zabc")
+    assert SwapFirstLast(s) == LetterSeq("zbca")
+    assert (Max(s), Min(s)) == ("z", "a")
+    assert TripleSucc(s) == LetterSeq("def}")
+    assert Rotate2ThenReverse(LetterSeq("abc")) == LetterSeq("acb")
+    assert Succ(LetterSeq("\xff")) is None
+
+
+def test_letter_seq_in_engine():
+    engine = TermRewriteSystem()
+    engine.add_rule(Node("Twice", Var("X")), Node("Succ", Node("Succ", Var("X"))))
+    assert engine.rewrite(Node("Twice", LetterSeq("abc"))) == LetterSeq("cde")
+    assert engine.steps == 3
+
+
+def test_engine_rewrites_inside_letter_seq():
+    engine = TermRewriteSystem()
+    engine.add_rule("a", "b")
+    assert engine.rewrite(LetterSeq("abc")) == engine.rewrite(Seq(*"abc")) == Seq(*"bbc")
+    letters = LetterSeq("xyz")
+    assert engine.rewrite(letters) is letters
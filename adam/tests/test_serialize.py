@@ -0,0 +1,95 @@
+import io
+
+import pytest
+from lsd.method import Method, MethodRule, Succ
+from lsd.parser import parse
+from lsd.serialize import MAGIC, VERSION, dump_many, dumps, load_many, loads
+from lsd.term import LetterSeq, Node, Seq, Span, TermRule, Var, Wildcard
+from lsd.trace import RewriteStep
+from lsd.trs import TermRewriteSystem
+
+TERMS = [
+    "a",
+    "",
+    "λ",
+    0,
+    -3,
+    2**70,
+    1.5,
+    True,
+    None,
+    Seq(),
+    Seq("a", Seq("b"), 1),
+    Node("F"),
+    Node(Node("H", "x"), "a", Seq("b", "c")),
+    parse("F[!X *Y ?Z +W]"),
+    Var("X", Span(2, 5), (int, "Box")),
+    Wildcard(),
+    LetterSeq("abc"),
+    TermRule(parse("F[!X]"), parse("G[!X]")),
+    (1, "a", (2,)),
+]
+
+
+@pytest.mark.parametrize("obj", TERMS)
+def test_roundtrip(obj):
+    out = loads(dumps(obj))
+    assert out == obj and type(out) is type(obj)
+
+
+def test_structure_sharing():
+    big = Node("F", *(Node("G", str(i)) for i in range(100)))
+    once, twice = dumps(big), dumps(Seq(big, big))
+    assert len(twice) < len(once) + 8
+    a, b = loads(twice)
+    assert a is b and a == big
+
+
+def test_equal_values_of_other_types_are_not_shared():
+    nodes = Seq(Node("f", 1), Node("f", True), Node("f", 1.0), Node("f", Seq(0.0), Seq(-0.0)))
+    for obj in (*nodes, nodes):
+        out = loads(dumps(obj))
+        assert out == obj and repr(out) == repr(obj)
+    out = loads(dumps(nodes))
+    assert [type(node.body[0]) for node in out[:3]] == [int, bool, float]
+
+
+def test_trace_roundtrip():
+    engine = TermRewriteSystem()
+    engine.add_rule("F", Seq("F", "+", "F"))
+    engine.rewrite(Node("Box", Node("Succ", "a"), Seq("F")), 4)
+    steps = engine.get_trace()
+    assert any(isinstance(step.rule, MethodRule) for step in steps)
+    assert list(loads(dumps(steps))) == steps
+
+
+def test_custom_methods_must_be_given():
+    double = Method("Double", exec=lambda x: x * 2)
+    step = RewriteStep(MethodRule(double), Node("Double", 2), 4)
+    data = dumps(step)
+    with pytest.raises(ValueError):
+        loads(data)
+    assert loads(data, methods=[double]) == step
+    assert loads(dumps(MethodRule(Succ))) == MethodRule(Succ)
+
+
+def test_dump_many_streams():
+    rule = TermRule(parse("F[!X]"), parse("G[!X]"))
+    objs = [rule, Node("F", "a"), rule, Seq("x")]
+    file = io.BytesIO()
+    dump_many(objs, file)
+    file.seek(0)
+    loaded = load_many(file)
+    assert next(loaded) == rule
+    assert list(loaded) == objs[1:]
+
+
+def test_rejects_foreign_data():
+    with pytest.raises(ValueError):
+        loads(b"nope")
+    with pytest.raises(ValueError):
+        loads(MAGIC + bytes([VERSION + 1]))
+    with pytest.raises(ValueError):
+        loads(dumps(Seq("a", "b"))[:-1])
+    with pytest.raises(TypeError):
+        dumps(object())
@@ -0,0 +1,113 @@
+import pytest
+from lsd.parser import parse
+from lsd.strategy import (
+    FAIL,
+    ID,
+    Choice,
+    Rules,
+    Strategy,
+    Then,
+    all_,
+    bottomup,
+    choice,
+    engine_rules,
+    one,
+    repeat,
+    rules,
+    then,
+    topdown,
+    try_,
+)
+from lsd.term import Node, Seq, TermRule
+from lsd.trs import TermRewriteSystem
+
+A_B = TermRule("a", "b")
+B_C = TermRule("b", "c")
+F_G = TermRule(parse("F[!X]"), parse("G[!X]"))
+
+
+class TestCombinators:
+    def test_try_and_id_keep_the_object(self):
+        term = Node("F", "x", Node("H", "y"))
+        assert try_(rules(A_B))(term) is term
+        assert topdown(try_(rules(A_B)))(term) is term
+        assert ID(term) is term
+        assert FAIL(term) is None
+
+    def test_topdown_vs_bottomup(self):
+        s = try_(rules(F_G, A_B))
+        term = Node("F", Node("F", "a"))
+        assert topdown(s)(term) == Node("G", Node("G", "b"))
+        assert bottomup(s)(term) == Node("G", Node("G", "b"))
+        # topdown fires at the root before it sees the children
+        assert topdown(try_(rules(TermRule(parse("F[F[!X]]"), "top"))))(term) == "top"
+
+    def test_all_and_one(self):
+        s = rules(A_B)
+        assert all_(s)(Node("F", "a", "a")) == Node("F", "b", "b")
+        assert all_(s)(Node("F", "a", "x")) is None
+        assert one(s)(Node("F", "x", "a", "a")) == Node("F", "x", "b", "a")
+        assert one(s)(Node("F", "x")) is None
+        assert one(s)("a") is None
+
+    def test_repeat_stops(self):
+        s = rules(A_B, B_C)
+        assert repeat(s)("a") == "c"
+        assert repeat(try_(s))("a") == "c"
+        assert repeat(one(s))(Node("F", "a", "b")) == Node("F", "c", "c")
+
+    def test_seq_results_are_spliced(self):
+        split = TermRule("x", Seq("y", "y"))
+        assert topdown(try_(rules(split)))(Seq("x", "z")) == Seq("y", "y", "z")
+
+    def test_then_and_choice(self):
+        assert (rules(A_B) >> rules(B_C))("a") == "c"
+        assert (rules(A_B) >> rules(A_B))("a") is None
+        assert (rules(F_G) | rules(A_B))("a") == "b"
+
+    def test_strategy_must_implement_call(self):
+        class Unfinished(Strategy):
+            __slots__ = ()
+
+        with pytest.raises(TypeError):
+            Unfinished()
+
+
+class TestFusion:
+    def test_wrappers_collapse(self):
+        s = rules(A_B)
+        t, r = try_(s), repeat(s)
+        assert try_(t) is t
+        assert try_(r) is r
+        assert repeat(repeat(s)).inner is s
+        assert repeat(try_(s)).inner is s
+        assert try_(FAIL) is ID
+        assert topdown(ID) is ID
+
+    def test_adjacent_rules_fuse_into_one_dispatch(self):
+        s = rules(A_B) | rules(B_C) | rules(F_G)
+        assert isinstance(s, Rules)
+        assert s.rules == (A_B, B_C, F_G)
+
+    def test_nested_compositions_flatten(self):
+        a, b, c = rules(A_B), rules(B_C), rules(F_G)
+        s = then(a >> b, ID, c)
+        assert isinstance(s, Then) and s.parts == (a, b, c)
+        t = choice(topdown(a), choice(topdown(b), ID, topdown(c)))
+        assert isinstance(t, Choice) and len(t.parts) == 3
+
+
+class TestEngineStrategy:
+    def test_rewrite_with_strategy_object(self):
+        engine = TermRewriteSystem(strategy=topdown(try_(rules(A_B, F_G))))
+        assert engine.rewrite(Node("F", "a")) == Node("G", "b")
+        assert [step.rule for step in engine.trace] == [F_G, A_B]
+        assert engine.steps == 2
+
+    def test_engine_rules(self):
+        engine = TermRewriteSystem(strategy=bottomup(repeat(engine_rules())))
+        engine.add_rule(Node("Succ", "x"), "y")
+        assert engine.rewrite(Node("Box", Node("Succ", "a"), Node("Succ", "x"))) == Node(
+            "Box", "b", "y"
+        )
+        assert engine_rules()("a") is None
@@ -1,8 +1,8 @@
 import pytest
 
 from lsd.env import Env
-from lsd.substitute import substitute
-from lsd.term import Node, Seq, Var
+from lsd.substitute import compile_template, substitute
+from lsd.term import Node, Seq, TermRule, Var
 
 
 def test_substitute_single_variable():
@@ -77,3 +77,37 @@ def test_spread_variable_multiple_elements_error():
     env = Env(X=("x", "y"))
     with pytest.raises(ValueError):
         substitute(Var("X"), env)
+
+
+@pytest.mark.parametrize(
+    "template, env",
+    [
+        (Var("A"), Env(A=("x",))),
+        (Seq(Var("A"), "k", Var("B")), Env(A=("x",), B=("y", "z"))),
+        (Seq(Var.from_prefix("?", "Z"), "k"), Env()),
+        (Node(Var("A"), "a", Node("G", Var("B")), "b"), Env(A=("F",), B=("y",))),
+        (Node("F", Seq(Var("A"), "c"), Var.from_prefix("*", "S")), Env(A=("x",), S=())),
+        (Var("S"), Env(S=Seq("a", "b"))),
+    ],
+)
+def test_compiled_template_matches_substitute(template, env):
+    assert compile_template(template)(env) == substitute(template, env)
+
+
+def test_compiled_template_shares_ground_subterms():
+    ground = Node("G", Seq("a", "b"))
+    build = compile_template(Node("F", ground, Var("X")))
+    first, second = build(Env(X=("x",))), build(Env(X=("y",)))
+    assert first.body[0] is second.body[0]
+    constant = compile_template(ground)
+    assert constant(Env()) is constant(Env(X=("x",)))
+
+
+def test_compiled_template_checks_bound_variables():
+    compile_template(Seq(Var("A"), Var.from_prefix("?", "B")), bound={"A"})
+    with pytest.raises(ValueError):
+        compile_template(Node("F", Var("B")), bound={"A"})
+    with pytest.raises(KeyError):
+        compile_template(Seq(Var("Z")))(Env())
+    with pytest.raises(ValueError):
+        TermRule(Node("F", Var("A")), Node("G", Var("B"))).compile()
@@ -1,5 +1,19 @@
+import gc
+import pickle
 import unittest
-from lsd.term import Node, Rule, Seq, Span, TermRule, Var, check_guard
+from lsd.term import (
+    InternTable,
+    LetterSeq,
+    Node,
+    Rope,
+    Rule,
+    Seq,
+    Span,
+    TermRule,
+    Var,
+    Wildcard,
+    check_guard,
+)
 
 
 class TestSeq(unittest.TestCase):
@@ -16,6 +30,21 @@ class TestSeq(unittest.TestCase):
         self.assertIsInstance(s, Seq)
         self.assertEqual(s, (1, 2, 3))
 
+    def test_view(self):
+        """A SeqView is a window onto a Seq that compares like the slice it stands for"""
+        s = Seq(*"abcdef")
+        v = s.view(1, 4)
+        self.assertEqual(len(v), 3)
+        self.assertEqual(list(v), ["b", "c", "d"])
+        self.assertEqual(v, Seq("b", "c", "d"))
+        self.assertEqual(Seq("b", "c", "d"), v)
+        self.assertEqual(v[1:], ("c", "d"))
+        self.assertIs(v[1:].base, s)
+        self.assertEqual(v[-1], "d")
+        self.assertEqual(hash(v), hash(("b", "c", "d")))
+        with self.assertRaises(IndexError):
+            v[3]
+
 
 class TestNode(unittest.TestCase):
     def test_basic_node(self):
@@ -49,6 +78,31 @@ class TestRule(unittest.TestCase):
         self.assertEqual(rule.pattern, lhs)
         self.assertEqual(rule.rhs, rhs)
 
+    def test_apply_is_match_then_instantiate(self):
+        """A Rule implements `instantiate`; `apply` matches and then instantiates"""
+
+        class Swap(Rule):
+            pattern = Node("f", Var("x"), Var("y"))
+
+            def name(self):
+                return "Swap"
+
+            def instantiate(self, env):
+                return Node("f", *env["y"], *env["x"])
+
+        self.assertEqual(Swap().apply(Node("f", 1, 2)), Node("f", 2, 1))
+        self.assertIsNone(Swap().apply(Node("g", 1, 2)))
+
+        class ApplyOnly(Rule):
+            def name(self):
+                return "ApplyOnly"
+
+            def apply(self, term):
+                return term
+
+        with self.assertRaises(TypeError):
+            ApplyOnly()
+
 
 class TestVar(unittest.TestCase):
     def test_var_fields_and_repr(self):
@@ -75,3 +129,129 @@ class TestGuard(unittest.TestCase):
         self.assertFalse(check_guard(int, "hi"))
         self.assertFalse(check_guard(int, ("a", "b", "c")))
         self.assertFalse(check_guard("Xyz", Node("Abc")))
+
+
+class TestTermCore(unittest.TestCase):
+    def test_terms_are_hashable(self):
+        """Equal terms hash equal and can key a dict"""
+        table = {
+            Node("f", 1, Seq("a")): "node",
+            Seq("a", Node("g")): "seq",
+            Var("x", Span(0, None), (int,)): "var",
+            Wildcard(): "wild",
+        }
+        self.assertEqual(table[Node("f", 1, Seq("a"))], "node")
+        self.assertEqual(table[Seq("a", Node("g"))], "seq")
+        self.assertEqual(table[Var("x", Span(0, None), (int,))], "var")
+        self.assertEqual(table[Wildcard()], "wild")
+        self.assertEqual(hash(Seq(1, 2)), hash((1, 2)))
+
+    def test_terms_have_no_dict(self):
+        """Term classes use slots"""
+        for term in [Node("f", 1), Seq(1), Var("x"), Wildcard()]:
+            self.assertFalse(hasattr(term, "__dict__"), type(term))
+
+    def test_node_is_immutable(self):
+        n = Node("f", 1)
+        with self.assertRaises(AttributeError):
+            n.head = "g"
+        with self.assertRaises(AttributeError):
+            del n.body
+
+    def test_node_equality(self):
+        self.assertEqual(Node("f", Node("g", 1)), Node("f", Node("g", 1)))
+        self.assertNotEqual(Node("f", Node("g", 1)), Node("f", Node("g", 2)))
+        self.assertNotEqual(Node("f", 1), Seq("f", 1))
+
+    def test_unhashable_contents(self):
+        """A Node holding something unhashable is still a term, just not a key"""
+        n = Node("f", [1])
+        self.assertEqual(n, Node("f", [1]))
+        with self.assertRaises(TypeError):
+            hash(n)
+
+    def test_pickle_roundtrip(self):
+        for term in [Node("f", Node("g", 1), Seq("a")), Seq(1, "b"), Var("x", Span(0, 1))]:
+            copy = pickle.loads(pickle.dumps(term))
+            self.assertEqual(copy, term)
+            self.assertEqual(hash(copy), hash(term))
+
+
+class TestInternTable(unittest.TestCase):
+    def test_equal_terms_are_identical(self):
+        table = InternTable()
+        a = table.intern(Seq(Node("f", "x"), Node("f", "x")))
+        self.assertIs(a[0], a[1])
+        self.assertIs(table.intern(Node("f", "x")), a[0])
+        self.assertIs(table.intern(a), a)
+        self.assertIs(table.seq(Node("f", "x"), Node("f", "x")), a)
+
+    def test_interned_equality_is_identity(self):
+        table = InternTable()
+        f, g = table.node("f", 1), table.node("g", 1)
+        self.assertNotEqual(f, g)
+        self.assertEqual(f, Node("f", 1))
+        self.assertEqual(Node("f", 1), f)
+
+    def test_nodes_are_collected(self):
+        table = InternTable()
+        node = table.node("f", table.node("g"))
+        self.assertEqual(len(table._nodes), 2)
+        del node
+        gc.collect()
+        self.assertEqual(len(table._nodes), 0)
+
+    def test_clear_keeps_old_nodes_equal(self):
+        table = InternTable()
+        old = table.node("f", 1)
+        table.clear()
+        self.assertEqual(len(table), 0)
+        new = table.node("f", 1)
+        self.assertIsNot(new, old)
+        self.assertEqual(new, old)
+
+
+class TestRope(unittest.TestCase):
+    def test_reads_like_a_seq(self):
+        items = [str(i) for i in range(300)]
+        rope = Rope.of(items)
+        self.assertEqual(len(rope), 300)
+        self.assertEqual(rope[150], "150")
+        self.assertEqual(rope[-1], "299")
+        self.assertEqual(rope, Seq(*items))
+        self.assertEqual(Seq(*items), rope)
+        self.assertEqual(hash(rope), hash(Seq(*items)))
+        self.assertEqual(list(rope.iter_from(297)), ["297", "298", "299"])
+        self.assertEqual(rope[10:13].to_seq(), Seq("10", "11", "12"))
+
+    def test_splices_stay_balanced(self):
+        items = list(range(1000))
+        rope = Rope.of(items)
+        for i in range(0, 2000, 7):
+            items[i : i + 1] = ["x", "y"]
+            rope = rope.splice(i, i + 1, ["x", "y"])
+        self.assertEqual(list(rope), items)
+        left, right = rope.split(500)
+        self.assertEqual(list(left + right), items)
+        self.assertLess(rope.height, 12)
+
+
+class TestLetterSeq(unittest.TestCase):
+    def test_conversions(self):
+        letters = LetterSeq.from_seq(Seq("a", "b", "c"))
+        self.assertEqual(letters, LetterSeq("abc"))
+        self.assertEqual(letters.to_seq(), Seq("a", "b", "c"))
+        self.assertEqual(str(letters), "abc")
+        self.assertEqual(list(letters), ["a", "b", "c"])
+        self.assertEqual(letters[1:], LetterSeq("bc"))
+        with self.assertRaises(ValueError):
+            LetterSeq.from_seq(Seq("ab", "c"))
+        with self.assertRaises(ValueError):
+            LetterSeq.from_seq(Seq(1, 2))
+
+    def test_equal_to_seq(self):
+        letters = LetterSeq("abc")
+        self.assertEqual(Seq("a", "b", "c"), letters)
+        self.assertEqual(hash(letters), hash(Seq("a", "b", "c")))
+        self.assertNotEqual(letters, Seq("a", "b"))
+        self.assertEqual(pickle.loads(pickle.dumps(letters)), letters)
@@ -0,0 +1,112 @@
+import pytest
+from lsd.analogy import AnalogySolver
+from lsd.term import Node, Seq, TermRule
+from lsd.trace import COMPACT, COUNTERS, FULL, OFF, RING, SAMPLE, Trace
+from lsd.trs import TermRewriteSystem
+
+KOCH = TermRule("F", Seq(*"F+F-F-F+F"))
+
+
+def koch(**kwargs) -> TermRewriteSystem:
+    engine = TermRewriteSystem(rules=[KOCH], **kwargs)
+    engine.rewrite(Seq("F"), 3)
+    return engine
+
+
+def test_full_trace_is_default():
+    engine = koch()
+    assert engine.trace.mode == FULL
+    assert len(engine.trace) == engine.steps == 1 + 5 + 25
+
+
+def test_ring_keeps_the_last_steps():
+    full, ring = koch(), koch(trace_mode=RING, trace_size=4)
+    assert list(ring.trace) == full.get_trace()[-4:]
+    assert ring.steps == full.steps
+
+
+def test_sample_keeps_one_in_n():
+    full, sample = koch(), koch(trace_mode=SAMPLE, trace_every=10)
+    assert list(sample.trace) == full.get_trace()[::10]
+
+
+def test_counters_only():
+    engine = koch(trace_mode=COUNTERS)
+    assert len(engine.trace) == 0
+    assert engine.trace.counts == {KOCH: 31}
+
+
+def test_count_without_terms():
+    trace = Trace(COUNTERS)
+    trace.count(KOCH)
+    assert trace.counts == {KOCH: 1} and trace.seen == 1
+    with pytest.raises(ValueError):
+        Trace(FULL).count(KOCH)
+
+
+def test_off():
+    engine = koch(trace_mode=OFF)
+    assert not engine.trace and engine.steps == 31
+    engine.clear_trace()
+    assert engine.trace.seen == 0
+
+
+def test_mode_survives_reset():
+    engine = koch(trace_mode=RING, trace_size=2)
+    engine.reset()
+    assert engine.trace.mode == RING and engine.trace.size == 2
+
+
+def test_unknown_mode():
+    with pytest.raises(ValueError):
+        Trace("verbose")
+
+
+@pytest.mark.parametrize("mode", [FULL, COUNTERS, OFF])
+def test_learn_checks_fired_steps(mode):
+    solver = AnalogySolver(engine=TermRewriteSystem(trace_mode=mode))
+    solver.learn(Node("Succ", "a"), "b", "succ")
+    with pytest.raises(RuntimeError):
+        solver.learn("b", "b", "id")
+
+
+def test_compact_trace_rebuilds_steps():
+    full, compact = koch(), koch(trace_mode=COMPACT)
+    assert [(s.rule, s.input, s.output) for s in compact.get_trace()] == [
+        (s.rule, s.input, s.output) for s in full.get_trace()
+    ]
+    assert [step.path for step in compact.trace][:4] == [(0,), (0,), (2,), (4,)]
+    assert compact.trace.rules == [KOCH]
+
+
+def test_compact_step_that_no_longer_applies():
+    trace = Trace(COMPACT)
+    trace.record(TermRule("a", "b"), "x", "y")
+    assert len(trace) == 1
+    with pytest.raises(ValueError):
+        trace[0]
+
+
+def test_compact_paths_locate_redexes():
+    engine = TermRewriteSystem(trace_mode=COMPACT)
+    engine.rewrite(Node("Box", "x", Seq("y", Node("Succ", "a"))))
+    assert [step.path for step in engine.trace] == [(1, 1)]
+
+
+@pytest.mark.parametrize("mode", [FULL, COMPACT])
+def test_replay(mode):
+    recorded = TermRewriteSystem(rules=[KOCH], trace_mode=mode)
+    axiom = Seq("F", Node("Succ", "a"))
+    final = recorded.rewrite(axiom, 3)
+    # The replaying engine does not even know the Koch rule.
+    offline = TermRewriteSystem()
+    assert offline.replay(axiom, recorded.trace) == final
+    assert offline.steps == recorded.steps
+
+
+def test_replay_rejects_foreign_trace():
+    recorded = koch(trace_mode=COMPACT)
+    with pytest.raises(ValueError):
+        TermRewriteSystem().replay(Seq("G"), recorded.trace)
+    with pytest.raises(ValueError):
+        TermRewriteSystem().replay(Seq("F"), koch(trace_mode=RING).trace)
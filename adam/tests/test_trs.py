@@ -1,8 +1,28 @@
 import pytest
+from lsd.budget import (
+    CYCLE,
+    MAX_PASSES,
+    NORMAL,
+    SIZE_LIMIT,
+    STEP_LIMIT,
+    TIME_LIMIT,
+    Budget,
+    RewriteResult,
+    term_size,
+)
 from lsd.method import Method, MethodRule, Succ
+from lsd.parallel import ParallelRewriter
 from lsd.parser import parse
-from lsd.term import Node, Seq, Span, Var
-from lsd.trs import TermRewriteSystem
+from lsd.term import Node, Seq, Span, TermRule, Var
+from lsd.trs import (
+    HYBRID,
+    INNERMOST,
+    LEFTMOST,
+    OUTERMOST,
+    PARALLEL_OUTERMOST,
+    STRATEGIES,
+    TermRewriteSystem,
+)
 
 
 @pytest.fixture
@@ -131,3 +151,292 @@ def test_rewrite_with_vars(engine):
         ),
     )
     assert engine.rewrite(Seq("a", "x", "b", "c")) == Node("GotIt", "b", "c", "a")
+
+
+def test_intern_mode_shares_subterms():
+    engine = TermRewriteSystem(intern=True)
+    engine.add_rule("A", Seq(Node("Leaf", "x"), Node("Leaf", "x")))
+    engine.add_rule(Node("Wrap", Var("X")), Node("Pair", Var("X"), Var("X")))
+    out = engine.rewrite(Seq(Node("Wrap", Node("Leaf", "x")), "A"))
+    assert out == Seq(
+        Node("Pair", Node("Leaf", "x"), Node("Leaf", "x")),
+        Node("Leaf", "x"),
+        Node("Leaf", "x"),
+    )
+    assert out[0].body[0] is out[0].body[1] is out[1] is out[2]
+
+
+def test_reset_releases_interned_terms():
+    engine = TermRewriteSystem(intern=True)
+    engine.rewrite(Seq(Seq("a", "b"), Node("f", "c")))
+    assert engine.interner is not None and len(engine.interner)
+    engine.reset()
+    assert len(engine.interner) == 0
+
+
+def test_normal_form_cache_hits():
+    engine = TermRewriteSystem(cache_size=16)
+    term = Seq(Node("Succ", "a"), Node("Succ", "a"))
+    assert engine.rewrite(term) == Seq("b", "b")
+    steps = len(engine.trace)
+    assert engine.rewrite(term) == Seq("b", "b")
+    assert len(engine.trace) == steps
+    assert engine.cache_info().hits >= 1
+
+
+def test_normal_form_cache_invalidation():
+    engine = TermRewriteSystem(cache_size=16)
+    engine.add_rule(Node("F", "a"), "b")
+    engine.add_rule(Node("H", "x"), "y")
+    assert engine.rewrite(Node("F", "a")) == "b"
+    assert engine.rewrite(Node("H", "x")) == "y"
+    assert engine.rewrite(Node("G", "a")) == Node("G", "a")
+    # a rule on G cannot change the derivations rooted at F or H
+    engine.add_rule(Node("G", "a"), "c")
+    assert len(engine.cache) >= 2
+    assert engine.rewrite(Node("G", "a")) == "c"
+    # a rule on the atom b invalidates every derivation that reached b
+    engine.add_rule("b", "z")
+    assert engine.rewrite(Node("F", "a")) == "z"
+    assert engine.rewrite(Node("H", "x")) == "y"
+
+
+def test_normal_form_cache_keeps_intermediate_states():
+    def engine(cache_size):
+        engine = TermRewriteSystem(cache_size=cache_size)
+        engine.add_rule("a", "b")
+        engine.add_rule("b", "c")
+        engine.add_rule(Node("F", "b"), "X")
+        return engine
+
+    cached, uncached = engine(16), engine(0)
+    assert cached.rewrite("a") == "c"
+    # F[b] is reached on the way from F[a] to F[c], so the rule on F[b] must still fire.
+    assert cached.rewrite(Node("F", "a")) == uncached.rewrite(Node("F", "a")) == "X"
+
+
+def test_normal_form_cache_reset():
+    engine = TermRewriteSystem(cache_size=16)
+    engine.rewrite(Node("Succ", "a"))
+    assert len(engine.cache) > 0
+    engine.reset()
+    assert len(engine.cache) == 0
+    assert TermRewriteSystem().cache_info() is None
+
+
+def test_rewrite_once_returns_same_object_when_nothing_fires(engine):
+    term = Seq(Node("Box", "x", Seq("y")), "z")
+    assert engine.rewrite_once(term) is term
+    assert engine.rewrite(term) is term
+
+
+def test_rewrite_max_counts_passes(engine):
+    engine.add_rule("F", Seq(*"FF"))
+    assert engine.rewrite(Seq("F"), 0) == Seq("F")
+    assert engine.rewrite(Seq("F"), 1) == Seq(*"FF")
+    assert engine.rewrite(Seq("F"), 3) == Seq(*"F" * 8)
+
+
+def test_long_derivation_does_not_recurse(engine):
+    # Each pass drops one x; far more passes than the interpreter recursion limit.
+    engine.add_rule(parse("Loop[x *R]"), parse("Loop[*R]"))
+    n = 5000
+    assert engine.rewrite(Node("Loop", *"x" * n)) == Node("Loop")
+
+
+def test_normal_subterms_are_reused(engine):
+    stable = Node("Box", *"xyz")
+    out = engine.rewrite(Node("Pair", stable, Node("Succ", "a")))
+    assert out == Node("Pair", stable, "b")
+    assert out.body[0] is stable
+    assert engine._known_normal(stable) and engine._known_normal(out)
+
+
+def test_normal_marks_dropped_on_rule_change(engine):
+    stable = Node("Box", "x")
+    assert engine.rewrite(stable) is stable
+    engine.add_rule(Node("Box", Var("X")), Var("X"))
+    assert engine.rewrite(stable) == "x"
+
+
+def test_normal_marks_released_on_reset(engine):
+    stable = Node("Box", "x")
+    assert engine.rewrite(stable) is stable
+    assert engine._known_normal(stable)
+    engine.reset()
+    assert not engine._known_normal(stable) and not engine._normal
+
+
+def test_unchanged_seq_pass_keeps_the_seq(engine):
+    term = Seq(*"xyz", Node("Succ", "a"))
+    out = engine.rewrite_once(term)
+    assert out == Seq(*"xyz", "b")
+    assert engine.rewrite_once(out) is out
+
+
+@pytest.mark.parametrize("strategy", STRATEGIES)
+def test_strategies_agree_on_normal_forms(strategy):
+    engine = TermRewriteSystem(strategy=strategy)
+    engine.add_rule(Node("Succ", "a"), "b")
+    engine.add_rule(Node("Succ", "b"), "c")
+    term = Node("Box", "c", Node("Succ", "b"), Node("Succ", Node("Succ", "a")))
+    assert engine.rewrite(term) == Node("Box", "c", "c", "c")
+    assert engine.steps == len(engine.trace)
+
+
+@pytest.mark.parametrize(
+    "strategy, nested, pair",
+    [
+        (HYBRID, Node("G", "a"), Seq("b", "b")),
+        (INNERMOST, Node("F", "b"), Seq("b", "b")),
+        (OUTERMOST, Node("G", "a"), Seq("b", "a")),
+        (PARALLEL_OUTERMOST, Node("G", "a"), Seq("b", "b")),
+        (LEFTMOST, Node("F", "b"), Seq("b", "a")),
+    ],
+)
+def test_strategy_single_pass(strategy, nested, pair):
+    engine = TermRewriteSystem(strategy=strategy)
+    engine.add_rule(parse("F[!X]"), parse("G[!X]"))
+    engine.add_rule("a", "b")
+    assert engine.rewrite(Node("F", "a"), 1) == nested
+    assert engine.rewrite(Seq("a", "a"), 1) == pair
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        TermRewriteSystem(strategy="sideways")
+
+
+@pytest.mark.skipif(not ParallelRewriter.available(), reason="needs fork")
+def test_parallel_rewrite_matches_serial():
+    rules = [TermRule("F", Seq(*"F+F-F-F+F")), TermRule(Node("G", Var("X")), Var("X"))]
+    axiom = Seq("F", Node("G", "F"), "+")
+    for mode in ("full", "compact", "counters"):
+        serial = TermRewriteSystem(rules=rules, trace_mode=mode)
+        parallel = TermRewriteSystem(rules=rules, workers=2, parallel_threshold=8, trace_mode=mode)
+        try:
+            assert parallel.rewrite(axiom, 4) == serial.rewrite(axiom, 4)
+            assert parallel.trace == serial.trace
+            assert parallel.steps == serial.steps
+            assert parallel.trace.counts == serial.trace.counts
+        finally:
+            parallel.close()
+
+
+def test_budget_step_limit():
+    engine = TermRewriteSystem(budget=Budget(max_steps=5))
+    engine.add_rule("x", "y")
+    engine.add_rule("y", "x")
+    result = engine.run(Seq("x", "y"))
+    assert result.status == STEP_LIMIT and result.steps == 5
+    # The result reflects exactly the steps fired: 3 passes, the last one cut short.
+    assert result.term == Seq("y", "y") and result.passes == 3
+
+
+def test_budget_size_limit():
+    engine = TermRewriteSystem(budget=Budget(max_size=100))
+    engine.add_rule("A", Seq("A", "B", "A"))
+    result = engine.run(Seq("A"))
+    assert result.status == SIZE_LIMIT
+    assert 50 < term_size(result.term) <= 100 + 3
+
+
+def test_budget_time_limit():
+    engine = TermRewriteSystem(budget=Budget(time_limit=0.05))
+    engine.add_rule("A", Seq("A", "B", "A"))
+    assert engine.run(Seq("A")).status == TIME_LIMIT
+
+
+def test_budget_does_not_mark_normal():
+    engine = TermRewriteSystem(budget=Budget(max_steps=1))
+    engine.add_rule(Node("F", "a"), "b")
+    term = Node("Box", Node("F", "a"), Node("F", "a"))
+    assert engine.rewrite(term) == Node("Box", "b", Node("F", "a"))
+    assert engine.status == STEP_LIMIT
+    engine.budget = None
+    assert engine.rewrite(term) == Node("Box", "b", "b")
+    assert engine.status == NORMAL
+
+
+def test_run_reports_status(engine):
+    engine.add_rule("F", Seq("F", "F"))
+    assert engine.run(Node("Succ", "a")) == RewriteResult("b", NORMAL, 1, 2)
+    assert engine.run(Seq("F"), 2).status == MAX_PASSES
+
+
+@pytest.mark.parametrize("window", [None, 4])
+def test_cycle_detection(window):
+    engine = TermRewriteSystem(cycle_window=window)
+    engine.add_rule("a", "b")
+    engine.add_rule("b", "c")
+    engine.add_rule("c", "a")
+    result = engine.run(Node("Box", "a"))
+    assert result.status == CYCLE and result.cycle_length == 3
+    assert result.term == Node("Box", "a") and result.passes == 3
+
+
+def test_cycle_longer_than_window():
+    engine = TermRewriteSystem(cycle_window=1, budget=Budget(max_steps=50))
+    engine.add_rule("a", "b")
+    engine.add_rule("b", "c")
+    engine.add_rule("c", "a")
+    assert engine.run("a").status == STEP_LIMIT
+
+
+def test_profile_counts_and_times(capsys):
+    engine = TermRewriteSystem(profile=True)
+    rule = TermRule(parse("F[!X]"), parse("G[!X]"))
+    engine.add_rule(rule)
+    assert engine.rewrite(Node("Box", Node("F", "a"), Node("Succ", "a"))) == Node(
+        "Box", Node("G", "a"), "b"
+    )
+    stats = {s.rule.name(): s for s in engine.stats()}
+    f = stats[rule.name()]
+    assert (f.attempts, f.matches, f.fires) == (1, 1, 1)
+    assert f.mean_size == term_size(Node("F", "a"))
+    succ = stats["MethodRule(Succ)"]
+    assert succ.fires == 1 and succ.build_time > 0
+
+    snapshot = engine.stats()
+    engine.rewrite(Node("F", "b"))
+    assert engine.stats()[0].attempts > snapshot[0].attempts
+    engine.print_stats()
+    assert "match ms" in capsys.readouterr().out
+    engine.reset_stats()
+    assert engine.stats() == []
+
+
+def test_profile_match_without_fire():
+    engine = TermRewriteSystem(profile=True)
+    engine.add_method(Method("Never", exec=lambda x: x, cond=lambda x: False))
+    assert engine.rewrite(Node("Never", "a")) == Node("Never", "a")
+    never = engine.stats()[0]
+    assert never.rule.name() == "MethodRule(Never)"
+    assert (never.attempts, never.matches, never.fires) == (1, 1, 0)
+    assert TermRewriteSystem().stats() == []
+
+
+@pytest.mark.parametrize("strategy", [OUTERMOST, LEFTMOST])
+@pytest.mark.parametrize("max", [None, 7])
+def test_rope_passes_match_plain_passes(strategy, max):
+    def engine(threshold):
+        trs = TermRewriteSystem(strategy=strategy, rope_threshold=threshold)
+        trs.add_rule("F", Seq("G", "+", "G"))
+        trs.add_rule("G", "H")
+        trs.add_rule(parse("K[!X]"), parse("!X"))
+        return trs
+
+    term = Seq(*"FxF", Node("K", "F"), "F")
+    plain, roped = engine(10**9), engine(2)
+    result = roped.run(term, max)
+    assert result == plain.run(term, max)
+    assert roped.get_trace() == plain.get_trace()
+    assert roped.run(result.term) == plain.run(result.term)
+
+
+def test_rope_falls_back_for_seq_rules():
+    engine = TermRewriteSystem(strategy=OUTERMOST, rope_threshold=2)
+    engine.add_rule("a", Seq("a", "b"))
+    # Fires at the root once the Seq is four long, which the rope pass must hand back for.
+    engine.add_rule(TermRule(Seq(Var("W"), Var("X"), Var("Y"), Var("Z")), "done"))
+    assert engine.run(Seq("a", "c")) == RewriteResult("done", NORMAL, 3, 4)